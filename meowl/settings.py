@@ -15,9 +15,34 @@ CSRF_TRUSTED_ORIGINS = [SITE_URL] if SITE_URL.startswith(("http://","https://"))
 
 # PDF/QR
 QR_TOKEN_MINUTES = int(os.getenv("QR_TOKEN_MINUTES", "15"))
+# "compact" (24 chars, smaller QR) or "signed" (Django TimestampSigner) for new tokens; both verify
+QR_TOKEN_FORMAT = os.getenv("QR_TOKEN_FORMAT", "compact")
+# verified tokens remembered in-process until they expire (meowls/tokens.py)
+QR_TOKEN_CACHE_SIZE = int(os.getenv("QR_TOKEN_CACHE_SIZE", "10000"))
+# "svg" (vector, no PIL) or "png" for QR codes drawn by the templates
+QR_IMAGE_FORMAT = os.getenv("QR_IMAGE_FORMAT", "svg")
+# Rendered posters are cached under MEDIA_ROOT/posters. Their QR codes carry
+# poster serial tokens, which don't expire (reissuing a poster drops its copy).
+POSTER_CACHE_SECONDS = int(os.getenv("POSTER_CACHE_SECONDS", str(30 * 24 * 3600)))
+# how stale a process's map of live poster serials may get when the cache is per-process
+POSTER_REVOCATION_REFRESH = int(os.getenv("POSTER_REVOCATION_REFRESH", "60"))
+POSTER_CACHE_MAX_BYTES = int(os.getenv("POSTER_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+# Background renders (manage.py poster_worker)
+POSTER_WORKERS = int(os.getenv("POSTER_WORKERS", "2"))
+POSTER_JOB_TIMEOUT = int(os.getenv("POSTER_JOB_TIMEOUT", "300"))  # seconds before a running job is retried
+POSTER_JOB_RETRY_SECONDS = int(os.getenv("POSTER_JOB_RETRY_SECONDS", "30"))  # first backoff after a failed render
 # points
 POINTS_SCAN = int(os.getenv("POINTS_SCAN", "5"))
 POINTS_VERIFY = int(os.getenv("POINTS_VERIFY", "10"))
+LEADERBOARD_CACHE_SECONDS = int(os.getenv("LEADERBOARD_CACHE_SECONDS", "30"))
+# audit log rows are buffered and bulk-written (meowls/audit.py); AUDIT_SYNC=1 writes each immediately
+AUDIT_SYNC = os.getenv("AUDIT_SYNC", "0") == "1"
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "50"))
+AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "2"))
+# Meowl.scan_count/last_scanned_at are recomputed at most this often (meowls/scanstats.py); 0 = every scan
+SCAN_STATS_FLUSH_SECONDS = float(os.getenv("SCAN_STATS_FLUSH_SECONDS", "60"))
+# rows per keyset batch in the streamed analytics exports (meowls/exports.py)
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
 
 # AUTH redirects
 LOGIN_URL = "/accounts/login/"
@@ -26,6 +51,9 @@ LOGOUT_REDIRECT_URL = "/"
 
 # Single official Meowl image (URL path). Put file at static/meowl_header.jpg
 MEOWL_HEADER_IMAGE = "/static/meowl_header.jpg"
+# Downscale static images embedded in posters to this many px on the long
+# side (2480 = A4 width at 300dpi). 0 embeds them as-is.
+POSTER_IMAGE_MAX_PX = int(os.getenv("POSTER_IMAGE_MAX_PX", "0"))
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -45,6 +73,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "meowls.metrics.ProfilingMiddleware",  # no-op unless PROFILING=1
 ]
 
 ROOT_URLCONF = "meowl.urls"
@@ -88,6 +117,25 @@ else:
         }
     }
 
+# --- Cache: locmem is per process; use file (one host) or redis when running several workers ---
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem").lower()
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.getenv("CACHE_LOCATION", str(BASE_DIR / "cache") if CACHE_BACKEND == "file" else "meowl"),
+    }
+}
+# per-view timings at /meowls/admin/metrics/ (meowls/metrics.py); slow requests go to the "meowls.slow" logger
+PROFILING = os.getenv("PROFILING", "0") == "1"
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+# anonymous pages / template fragments (meowls/caching.py); dropped early on writes
+PAGE_CACHE_SECONDS = int(os.getenv("PAGE_CACHE_SECONDS", "300"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
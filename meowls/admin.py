@@ -7,6 +7,7 @@ from .models import (
     Comment,
     PointsLedger,
     AuditLog,
+    PosterSerial,
 )
 
 @admin.register(Meowl)
@@ -44,9 +45,27 @@ class PointsLedgerAdmin(admin.ModelAdmin):
     list_filter = ("reason",)
     search_fields = ("user__username", "meowl__name", "meowl__slug")
 
+    # read-only: the UserPoints/DailyPoints rollups are only kept in step by
+    # utils.award_points, so a row written here would drift the leaderboard
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = ("id", "created_at", "actor", "action", "target_user", "meowl", "comment_id")
     list_filter = ("action",)
     search_fields = ("actor__username", "target_user__username", "meowl__slug")
     readonly_fields = ("created_at",)
+
+@admin.register(PosterSerial)
+class PosterSerialAdmin(admin.ModelAdmin):
+    list_display = ("id", "meowl", "created_by", "created_at", "revoked_at", "revoked_by")
+    list_filter = ("revoked_at",)
+    search_fields = ("meowl__name", "meowl__slug")
+    readonly_fields = ("created_at",)
@@ -0,0 +1,205 @@
+# meowls/api.py
+"""
+Read-only JSON API for map/kiosk clients.
+
+Rows are serialized straight from .values() querysets, no model instances.
+Every endpoint works out an ETag/Last-Modified from denormalized
+timestamps (Meowl.updated_at, comment times) with one aggregate query, or
+for the leaderboard from its cache version, and answers a matching
+conditional GET with 304 before building the body.
+
+Access mirrors the HTML pages: the Meowl list and leaderboard are public
+(coordinates in the list are staff-only); a Meowl's detail and comments
+need staff/owner or a valid QR token, like meowl_detail. Map lookups
+and tiles return nothing but coordinates, so they're staff-only.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Max, Q
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
+
+from . import geo
+from .caching import generation
+from .models import Comment, Meowl, MeowlQuerySet
+from .pagination import keyset_page
+from .tokens import verify_qr_token
+from .utils import LEADERBOARD_PERIODS, cached_leaderboard, leaderboard_version
+
+API_PAGE_SIZE = 100
+BBOX_LIMIT = 2000
+NEAREST_MAX_K = 100
+TILE_GRID = 8         # clusters per tile side
+TILE_CLUSTER_UNTIL = 17  # from this zoom on, tiles list every Meowl
+
+MEOWL_FIELDS = ("slug", "name", "description", "last_scanned_at", "scan_count", "updated_at")
+LOCATION_FIELDS = {"lat": F("current_location__lat"), "lng": F("current_location__lng")}
+
+
+def _conditional_json(request, etag_parts, last_modified, build):
+    """
+    304 if the client's copy matches, else JsonResponse(build()).
+    """
+    etag = '"%s"' % hashlib.sha1(repr(etag_parts).encode()).hexdigest()
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = JsonResponse(build())
+    response["ETag"] = etag
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+    # clients always revalidate; the 304 is what saves the bandwidth
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _may_open(request, meowl) -> bool:
+    if request.user.is_authenticated and (request.user.is_staff or request.user.pk == meowl["owner_id"]):
+        return True
+    return verify_qr_token(request.GET.get("t"), meowl["slug"])
+
+
+@require_GET
+def meowl_list(request):
+    """
+    Active Meowls by slug, API_PAGE_SIZE per page (?after=<next>).
+    """
+    staff = request.user.is_staff
+    meowls = Meowl.objects.filter(is_archived=False)
+    stamp = meowls.aggregate(last=Max("updated_at"), n=Count("id"))
+    after = request.GET.get("after")
+
+    def build():
+        rows = meowls.values(*MEOWL_FIELDS, **(LOCATION_FIELDS if staff else {}))
+        page = keyset_page(rows, ["slug"], after, API_PAGE_SIZE)
+        return {"results": page.items, "next": page.next_cursor}
+
+    return _conditional_json(request, ("meowls", staff, after, stamp["n"], stamp["last"]), stamp["last"], build)
+
+
+@require_GET
+def meowl_near(request):
+    """
+    Map lookups over active Meowls' current locations:
+      ?bbox=south,west,north,east   everything in the viewport (up to BBOX_LIMIT)
+      ?lat=..&lng=..&k=10           the k nearest, with distance_m
+    """
+    if not request.user.is_staff:
+        return JsonResponse({"error": "forbidden"}, status=403)
+    meowls = Meowl.objects.filter(is_archived=False)
+    try:
+        if "bbox" in request.GET:
+            south, west, north, east = (float(v) for v in request.GET["bbox"].split(","))
+            if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+                raise ValueError
+            rows = list(meowls.in_bbox(south, west, north, east).values(*MEOWL_FIELDS, **LOCATION_FIELDS)[:BBOX_LIMIT + 1])
+            return JsonResponse({"results": rows[:BBOX_LIMIT], "truncated": len(rows) > BBOX_LIMIT})
+        lat, lng = float(request.GET["lat"]), float(request.GET["lng"])
+        k = min(int(request.GET.get("k", 10)), NEAREST_MAX_K)
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180 and k > 0):
+            raise ValueError
+    except (KeyError, ValueError):
+        return JsonResponse({"error": "pass bbox=south,west,north,east or lat, lng and k"}, status=400)
+
+    rows = geo.nearest(
+        meowls.values(*MEOWL_FIELDS, **LOCATION_FIELDS), lat, lng, k,
+        point=lambda row: (row["lat"], row["lng"]), box=MeowlQuerySet.in_bbox,
+    )
+    return JsonResponse({"results": [{**row, "distance_m": round(d, 1)} for d, row in rows]})
+
+
+@require_GET
+def map_tile(request, z, x, y):
+    """
+    Markers for one z/x/y map tile: single Meowls as rows, crowded spots as
+    {"count", "lat", "lng"} clusters (below TILE_CLUSTER_UNTIL). Tiles are
+    cached until any location or Meowl changes (signals.py bumps "map").
+    """
+    if not request.user.is_staff:
+        return JsonResponse({"error": "forbidden"}, status=403)
+    if not (0 <= z <= geo.MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise Http404("No such tile")
+
+    key = f"meowls:tile:{generation('map')}:{z}:{x}:{y}"
+    markers = cache.get(key)
+    if markers is None:
+        rows = Meowl.objects.filter(is_archived=False).in_bbox(*geo.tile_bounds(z, x, y))
+        rows = list(rows.order_by().values("slug", "name", **LOCATION_FIELDS))
+        markers = rows if z >= TILE_CLUSTER_UNTIL else geo.cluster(rows, z, x, y, TILE_GRID)
+        cache.set(key, markers, settings.PAGE_CACHE_SECONDS)
+    response = JsonResponse({"z": z, "x": x, "y": y, "markers": markers})
+    patch_cache_control(response, private=True, max_age=60)
+    return response
+
+
+@require_GET
+def meowl_detail(request, slug):
+    meowl = (
+        Meowl.objects.filter(slug=slug)
+        .values(*MEOWL_FIELDS, "owner_id", "is_archived", **LOCATION_FIELDS)
+        .first()
+    )
+    if meowl is None:
+        raise Http404("No such Meowl")
+    if not _may_open(request, meowl):
+        return JsonResponse({"error": "forbidden"}, status=403)
+    del meowl["owner_id"]
+    return _conditional_json(request, ("meowl", meowl["slug"], meowl["updated_at"]), meowl["updated_at"], lambda: meowl)
+
+
+@require_GET
+def meowl_comments(request, slug):
+    """
+    A Meowl's comments, newest first, API_PAGE_SIZE per page (?after=<next>).
+    Staff also get hidden ones, as on the detail page.
+    """
+    meowl = Meowl.objects.filter(slug=slug).values("id", "slug", "owner_id").first()
+    if meowl is None:
+        raise Http404("No such Meowl")
+    if not _may_open(request, meowl):
+        return JsonResponse({"error": "forbidden"}, status=403)
+
+    staff = request.user.is_staff
+    comments = Comment.objects.filter(meowl_id=meowl["id"])
+    if not staff:
+        comments = comments.visible()
+    # hiding/unhiding moves hidden_at or the visible count even when nothing new was posted
+    stamp = Comment.objects.filter(meowl_id=meowl["id"]).aggregate(
+        last=Max("created_at"),
+        hidden=Max("hidden_at"),
+        n=Count("id"),
+        visible=Count("id", filter=Q(is_hidden=False)),
+    )
+    last_modified = max(filter(None, (stamp["last"], stamp["hidden"])), default=None)
+    after = request.GET.get("after")
+
+    def build():
+        rows = comments.values("id", "text", "created_at", "is_hidden", username=F("user__username"))
+        page = keyset_page(rows, ["-created_at", "-id"], after, API_PAGE_SIZE)
+        return {"results": page.items, "next": page.next_cursor}
+
+    parts = ("comments", meowl["id"], staff, after, stamp["n"], stamp["visible"], stamp["last"], stamp["hidden"])
+    return _conditional_json(request, parts, last_modified, build)
+
+
+@require_GET
+def leaderboard(request, period="all"):
+    if period not in LEADERBOARD_PERIODS:
+        raise Http404("Unknown leaderboard period")
+    # same version the cached rows are stored under, so ETag and body agree
+    version = leaderboard_version(period)
+
+    def build():
+        return {
+            "period": period,
+            "results": [
+                {"rank": rank, "username": row["user__username"], "points": row["total"] or 0}
+                for rank, row in enumerate(cached_leaderboard(period, version=version), start=1)
+            ],
+        }
+
+    return _conditional_json(request, ("leaderboard", period, version), None, build)
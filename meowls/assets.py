@@ -0,0 +1,104 @@
+# meowls/assets.py
+"""
+In-process static asset cache and WeasyPrint URL fetcher.
+
+Poster templates reference the header image as SITE_URL + /static/...;
+without this WeasyPrint would fetch it over HTTP from our own server on
+every render (and deadlock a single-worker deployment). Static URLs are
+instead read from the staticfiles finders / STATIC_ROOT once and kept in
+memory, optionally downscaled to print resolution.
+"""
+import hashlib
+import mimetypes
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+from weasyprint import default_url_fetcher
+
+# (path, max_px) -> (mtime, data, mime type)
+_assets: dict[tuple[str, int], tuple[float, bytes, str]] = {}
+
+
+def static_relpath(url: str) -> str | None:
+    """
+    "/static/x.jpg" or "<SITE_URL>/static/x.jpg" -> "x.jpg"; None for anything else.
+    """
+    site = settings.SITE_URL.rstrip("/")
+    if url.startswith(site + "/"):
+        url = url[len(site):]
+    if not url.startswith(settings.STATIC_URL):
+        return None
+    return url[len(settings.STATIC_URL):].split("?", 1)[0].split("#", 1)[0]
+
+
+def find_static(rel: str) -> str | None:
+    try:
+        path = finders.find(rel)
+        if not path and settings.STATIC_ROOT:
+            path = safe_join(settings.STATIC_ROOT, rel)
+    except SuspiciousFileOperation:
+        return None
+    return path if path and os.path.isfile(path) else None
+
+
+def _downscale(data: bytes, max_px: int) -> bytes:
+    from PIL import Image
+
+    img = Image.open(BytesIO(data))
+    if max(img.size) <= max_px:
+        return data
+    fmt = img.format
+    img.thumbnail((max_px, max_px))
+    out = BytesIO()
+    if fmt == "JPEG":
+        img.save(out, format="JPEG", quality=90, optimize=True)
+    else:
+        img.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+def load_static(rel: str, max_px: int = 0) -> tuple[bytes, str] | None:
+    """
+    (bytes, mime type) of a static file, served from memory after the first
+    read and reloaded only when its mtime changes. Images larger than
+    `max_px` on their long side are downscaled once and cached that way.
+    """
+    path = find_static(rel)
+    if not path:
+        return None
+    mtime = os.stat(path).st_mtime
+    key = (path, max_px)
+    cached = _assets.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    with open(path, "rb") as fh:
+        data = fh.read()
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if max_px and mime.startswith("image/") and mime != "image/svg+xml":
+        data = _downscale(data, max_px)
+    _assets[key] = (mtime, data, mime)
+    return data, mime
+
+
+def static_digest(rel: str, max_px: int = 0) -> str:
+    asset = load_static(rel, max_px)
+    if asset is None:
+        return "none"
+    return hashlib.sha1(asset[0]).hexdigest()
+
+
+def url_fetcher(url, *args, **kwargs):
+    """
+    WeasyPrint url_fetcher: static files from memory, everything else as usual.
+    """
+    rel = static_relpath(url)
+    if rel is not None:
+        asset = load_static(rel, settings.POSTER_IMAGE_MAX_PX)
+        if asset is not None:
+            return {"string": asset[0], "mime_type": asset[1], "redirected_url": url}
+    return default_url_fetcher(url, *args, **kwargs)
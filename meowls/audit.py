@@ -0,0 +1,141 @@
+# meowls/audit.py
+"""
+Buffered AuditLog writer.
+
+Every scan, create and moderation action logs a row; inserting each one on
+its own costs a write transaction (and on SQLite an fsync) per request.
+Events are instead queued in-process and written with one bulk_create once
+AUDIT_BATCH_SIZE are pending or the oldest has waited AUDIT_FLUSH_SECONDS.
+Whatever is left is flushed at exit. If the database rejects a batch, its
+rows are retried one at a time and only the ones that still fail are
+logged and dropped. AUDIT_SYNC=1 writes every row immediately, which is
+what tests and one-off scripts want.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending: list[AuditLog] = []
+_oldest = 0.0
+_timer: threading.Timer | None = None
+
+
+def log(actor, action: str, meowl=None, target_user=None, comment_id=None, detail: str = "") -> None:
+    """
+    Record an audit event. Queued once the surrounding transaction (if any)
+    commits, so rolled back actions leave no trace.
+    """
+    # only ids go in the buffer: an instance deleted before the flush would
+    # otherwise make bulk_create refuse the whole batch
+    entry = AuditLog(
+        actor_id=_pk(actor),
+        action=action,
+        meowl_id=_pk(meowl),
+        target_user_id=_pk(target_user),
+        comment_id=comment_id,
+        detail=detail,
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: _enqueue(entry))
+
+
+def _pk(obj):
+    return obj.pk if obj is not None else None
+
+
+def _arm() -> None:
+    # call with _lock held; makes sure a quiet period still gets written out
+    global _timer
+    if _timer is None:
+        _timer = threading.Timer(settings.AUDIT_FLUSH_SECONDS, _flush_in_thread)
+        _timer.daemon = True
+        _timer.start()
+
+
+def _enqueue(entry: AuditLog) -> None:
+    global _oldest
+    if settings.AUDIT_SYNC:
+        entry.save()
+        return
+    with _lock:
+        if not _pending:
+            _oldest = time.monotonic()
+        _pending.append(entry)
+        full = len(_pending) >= settings.AUDIT_BATCH_SIZE
+        due = time.monotonic() - _oldest >= settings.AUDIT_FLUSH_SECONDS
+        if not (full or due):
+            _arm()
+    if full or due:
+        flush()
+
+
+def _flush_in_thread() -> None:
+    try:
+        flush()
+    finally:
+        connections.close_all()
+
+
+def flush() -> int:
+    """
+    Write out everything pending; returns how many rows were written.
+    """
+    global _timer
+    with _lock:
+        batch = _pending[:]
+        _pending.clear()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    if not batch:
+        return 0
+    try:
+        AuditLog.objects.bulk_create(batch, batch_size=500)
+        return len(batch)
+    except Exception:
+        logger.warning("Couldn't bulk write %d audit rows; writing them one by one", len(batch), exc_info=True)
+    return _write_each(batch)
+
+
+def _write_each(batch: list[AuditLog]) -> int:
+    """
+    Insert rows one at a time after a failed batch. A row the database
+    rejects (say its Meowl was deleted meanwhile) is logged and dropped so
+    it can't hold up the rest; if the database itself is unavailable the
+    rows go back in the queue for the next flush.
+    """
+    written, retry = 0, []
+    for entry in batch:
+        entry.pk, entry._state.adding = None, True  # undo what the rolled back bulk_create set
+        try:
+            with transaction.atomic():
+                entry.save(force_insert=True)
+        except OperationalError:
+            retry.append(entry)
+        except Exception:
+            logger.exception(
+                "Dropping audit row: action=%s actor=%s meowl=%s target_user=%s comment=%s at=%s detail=%r",
+                entry.action, entry.actor_id, entry.meowl_id, entry.target_user_id,
+                entry.comment_id, entry.created_at.isoformat(), entry.detail,
+            )
+        else:
+            written += 1
+    if retry:
+        logger.error("Database unavailable; %d audit rows kept for the next flush", len(retry))
+        with _lock:
+            _pending[:0] = retry
+            _arm()
+    return written
+
+
+atexit.register(flush)
@@ -0,0 +1,219 @@
+# meowls/bench.py
+"""
+Synthetic dataset seeding and request benchmarking (manage.py seed_bench / bench).
+
+seed() bulk-inserts a dataset proportional to `scale` and then rebuilds
+every denormalized column (current location, scan stats, point rollups)
+the way the app would have. run() drives the main pages through the
+Django test client from a pool of threads and reports latency
+percentiles, queries per request and throughput.
+"""
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import audit, geo, scanstats
+from .models import AuditLog, Comment, Meowl, MeowlLocation, PointsLedger, Scan, UserStatus
+from .tokens import make_qr_token
+from .utils import rebuild_points
+
+BATCH = 2000
+
+# rows per unit of scale
+PER_SCALE = {"meowls": 100, "users": 200, "scans": 2000, "comments": 1000}
+SPREAD_DAYS = 45  # scans fall on the days before today
+
+
+def seed(scale: float = 1.0, seed_value: int = 0, prefix: str = "bench") -> dict:
+    """
+    Insert scale x PER_SCALE rows. Returns the row counts written.
+    """
+    rng = random.Random(seed_value)
+    n = {k: max(1, int(v * scale)) for k, v in PER_SCALE.items()}
+    now = timezone.now()
+    today = timezone.localdate(now)
+    password = make_password("bench")  # hashing once, not per user
+
+    with transaction.atomic():
+        owner = User.objects.create(username=f"{prefix}-staff", password=password, is_staff=True)
+        User.objects.bulk_create(
+            [User(username=f"{prefix}-user-{i}", password=password) for i in range(n["users"])], batch_size=BATCH
+        )
+        # bulk_create skips the post_save that makes UserStatus rows
+        users = list(User.objects.filter(username__startswith=f"{prefix}-user-").order_by("id"))
+        UserStatus.objects.bulk_create(
+            [UserStatus(user=u, email_verified=True) for u in [owner, *users]],
+            batch_size=BATCH, ignore_conflicts=True,
+        )
+
+        Meowl.objects.bulk_create(
+            [Meowl(name=f"Bench Meowl {i}", slug=f"{prefix}-{i}", owner=owner, description="Synthetic.")
+             for i in range(n["meowls"])],
+            batch_size=BATCH,
+        )
+        meowls = list(Meowl.objects.filter(slug__startswith=f"{prefix}-").order_by("id"))
+
+        locations = []
+        for m in meowls:
+            lat, lng = 30.27 + rng.uniform(-0.15, 0.15), -97.74 + rng.uniform(-0.15, 0.15)
+            locations.append(MeowlLocation(
+                meowl=m, lat=lat, lng=lng, geohash=geo.encode(lat, lng),
+                status="current", verified_at=now,
+            ))
+        MeowlLocation.objects.bulk_create(locations, batch_size=BATCH)
+
+        # distinct (meowl, user, day) triples spread over the past SPREAD_DAYS,
+        # so the 7d/30d leaderboards cover a part of the ledger, not all of it:
+        # each pass over the (meowl, user) pairs shifts every pair a day on,
+        # and only after SPREAD_DAYS passes does it go further back
+        scans, ledger, logs, stamps = [], [], [], {}
+        per_pass = len(meowls) * len(users)
+        for i in range(n["scans"]):
+            m, u = meowls[i % len(meowls)], users[(i // len(meowls)) % len(users)]
+            j, k = i % per_pass, i // per_pass
+            day = today - timedelta(days=1 + (j + k) % SPREAD_DAYS + SPREAD_DAYS * (k // SPREAD_DAYS))
+            # one time of day per day, so restoring them below is an UPDATE per day, not per row
+            when = stamps.setdefault(
+                day, timezone.make_aware(datetime.combine(day, datetime.min.time())) + timedelta(minutes=rng.randrange(1440))
+            )
+            scans.append(Scan(meowl=m, user=u, day=day))
+            ledger.append(PointsLedger(user=u, meowl=m, points=5, reason="scan"))
+            logs.append(AuditLog(actor=u, action="scan", meowl=m, created_at=when))
+        Scan.objects.bulk_create(scans, batch_size=BATCH)
+        PointsLedger.objects.bulk_create(ledger, batch_size=BATCH)
+        AuditLog.objects.bulk_create(logs, batch_size=BATCH)
+        # auto_now_add stamps "now" in bulk_create; put the spread back
+        days = [scan.day for scan in scans]  # ledger rows line up with the scans
+        _restore_created_at(Scan, scans, days, stamps)
+        _restore_created_at(PointsLedger, ledger, days, stamps)
+
+        # a fifth of the comments land on the first Meowl so it has a busy
+        # detail page; one in ten is hidden by staff
+        comments = []
+        for i in range(n["comments"]):
+            c = Comment(meowl=meowls[0 if not i % 5 else i % len(meowls)], user=rng.choice(users), text=f"Comment {i}")
+            if i % 10 == 3:
+                c.is_hidden, c.hidden_at, c.hidden_by = True, now, owner
+            comments.append(c)
+        Comment.objects.bulk_create(comments, batch_size=BATCH)
+
+        Meowl.objects.filter(slug__startswith=f"{prefix}-").refresh_current_location()
+        Meowl.objects.filter(slug__startswith=f"{prefix}-").refresh_scan_stats()
+        rebuild_points()
+
+    return {**n, "locations": len(locations), "ledger": len(ledger), "audit": len(logs)}
+
+
+def _restore_created_at(model, objs, days, stamps: dict) -> None:
+    by_day = {}
+    for obj, day in zip(objs, days):
+        by_day.setdefault(day, []).append(obj.pk)
+    for day, pks in by_day.items():
+        for i in range(0, len(pks), BATCH):
+            model.objects.filter(pk__in=pks[i:i + BATCH]).update(created_at=stamps[day])
+
+
+# --- driving requests ---
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    # nearest rank
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def _targets(prefix: str) -> dict:
+    """
+    path name -> (who is logged in: None/"user"/"staff", url factory)
+    """
+    slugs = list(Meowl.objects.filter(slug__startswith=f"{prefix}-").values_list("slug", flat=True))
+    tokens = {slug: make_qr_token(slug) for slug in slugs}
+
+    def detail(rng):
+        slug = rng.choice(slugs)
+        return f"{reverse('meowls:detail', args=[slug])}?t={tokens[slug]}"
+
+    return {
+        "index": (None, lambda rng: reverse("meowls:index")),
+        "index_user": ("user", lambda rng: reverse("meowls:index")),
+        "leaderboard": (None, lambda rng: reverse("meowls:leaderboard")),
+        "leaderboard_7d": ("user", lambda rng: reverse("meowls:leaderboard_period", args=["7d"])),
+        "detail": ("user", detail),
+        "staff_dashboard": ("staff", lambda rng: reverse("meowls:staff_dashboard")),
+        "pdf_file": ("staff", lambda rng: reverse("meowls:pdf_file", args=[rng.choice(slugs)])),
+    }
+
+
+PATHS = ("index", "index_user", "leaderboard", "leaderboard_7d", "detail", "staff_dashboard", "pdf_file")
+
+
+def run(paths=PATHS, requests: int = 200, workers: int = 4, warmup: int = 10, prefix: str = "bench") -> dict:
+    """
+    Fire `requests` GETs per path from `workers` threads. Each thread has
+    its own client (logged in as a random bench user, or the bench staff
+    user) and its own DB connection, so queries are counted per request.
+    """
+    targets = _targets(prefix)
+    users = list(User.objects.filter(username__startswith=f"{prefix}-user-"))
+    staff = User.objects.get(username=f"{prefix}-staff")
+    local = threading.local()
+
+    def client(role):
+        clients = getattr(local, "clients", None)
+        if clients is None:
+            clients = local.clients = {}
+            local.rng = random.Random(threading.get_ident())
+        if role not in clients:
+            c = clients[role] = Client()
+            if role == "user":
+                c.force_login(local.rng.choice(users))
+            elif role == "staff":
+                c.force_login(staff)
+        return clients[role]
+
+    def one(name):
+        role, url = targets[name]
+        c = client(role)
+        target = url(local.rng)
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = c.get(target)
+            if getattr(response, "streaming", False):
+                b"".join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        return elapsed, len(queries), response.status_code
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name in paths:
+            list(pool.map(one, [name] * warmup))
+            start = time.perf_counter()
+            samples = list(pool.map(one, [name] * requests))
+            wall = time.perf_counter() - start
+
+            times = sorted(s[0] * 1000 for s in samples)
+            results[name] = {
+                "requests": requests,
+                "errors": sum(1 for s in samples if s[2] >= 400),
+                "p50_ms": round(_percentile(times, 50), 2),
+                "p95_ms": round(_percentile(times, 95), 2),
+                "p99_ms": round(_percentile(times, 99), 2),
+                "mean_ms": round(sum(times) / len(times), 2),
+                "queries_per_request": round(sum(s[1] for s in samples) / len(samples), 2),
+                "throughput_rps": round(requests / wall, 1),
+            }
+    # detail scans queue audit rows and scan stats; write them while the DB is still ours
+    audit.flush()
+    scanstats.flush()
+    return results
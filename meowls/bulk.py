@@ -0,0 +1,109 @@
+# meowls/bulk.py
+"""
+Bulk poster export: many Meowls as one multi-page PDF or a ZIP of PDFs.
+
+Every poster is the shared base page plus its own QR image, so the only
+per-Meowl work is encoding the QR; manage.py export_posters runs that
+across a process pool, the dashboard export in the request's own process,
+and the output is streamed as the images come back.
+"""
+import itertools
+import logging
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from django.conf import settings
+
+from .models import Meowl
+from .pdf import build_poster_base, poster_qr_url, render_meowl_pdf, render_meowls_pdf
+from .pdfstamp import StampError, find_placeholder, iter_stamp_pages, qr_image_object, stamp_object
+from .poster_cache import get_poster_base
+from .utils import poster_serials
+
+logger = logging.getLogger(__name__)
+
+
+def select_meowls(slugs=None, owner=None, since=None, include_archived=False):
+    qs = Meowl.objects.order_by("name", "id")
+    if slugs:
+        qs = qs.filter(slug__in=slugs)
+    if owner:
+        qs = qs.filter(owner__username=owner)
+    if since:
+        qs = qs.filter(created_at__gte=since)
+    if not include_archived:
+        qs = qs.filter(is_archived=False)
+    return qs
+
+
+def _qr_objects(urls: list[str], workers: int | None) -> Iterator[bytes]:
+    if workers is None:
+        workers = settings.POSTER_WORKERS
+    if workers <= 1 or len(urls) < 2:
+        yield from map(qr_image_object, urls)
+        return
+    chunksize = max(1, len(urls) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(qr_image_object, urls, chunksize=chunksize)
+
+
+def iter_posters_pdf(meowls, workers: int | None = None) -> Iterator[bytes]:
+    """
+    One poster per page, streamed.
+    """
+    meowls = list(meowls)
+    serials = poster_serials(meowls)
+    urls = [poster_qr_url(m, serials[m.pk]) for m in meowls]
+    try:
+        chunks = iter_stamp_pages(get_poster_base(build_poster_base), _qr_objects(urls, workers), len(urls))
+        first = next(chunks)  # validates the base before anything is sent
+    except StampError:
+        logger.exception("Couldn't stamp poster base; rendering %d posters in full", len(meowls))
+        return iter([render_meowls_pdf(zip(meowls, urls))])
+    return itertools.chain([first], chunks)
+
+
+class _ChunkBuffer:
+    """
+    Write-only sink for ZipFile; hands back whatever was written since the last take().
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_posters_zip(meowls, workers: int | None = None) -> Iterator[bytes]:
+    """
+    A streamed ZIP with one <slug>.pdf per Meowl.
+    """
+    meowls = list(meowls)
+    serials = poster_serials(meowls)
+    urls = [poster_qr_url(m, serials[m.pk]) for m in meowls]
+    base = get_poster_base(build_poster_base)
+    try:
+        find_placeholder(base)
+        stamped = (stamp_object(base, obj) for obj in _qr_objects(urls, workers))
+    except StampError:
+        logger.exception("Couldn't stamp poster base; rendering %d posters in full", len(meowls))
+        stamped = (render_meowl_pdf(m, url) for m, url in zip(meowls, urls))
+
+    buf = _ChunkBuffer()
+    # PDFs barely deflate (the header image is already JPEG), so store them
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_STORED) as zf:
+        for m, data in zip(meowls, stamped):
+            zf.writestr(f"{m.slug}.pdf", data)
+            yield buf.take()
+    yield buf.take()
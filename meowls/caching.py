@@ -0,0 +1,73 @@
+# meowls/caching.py
+"""
+Page and fragment caching for the public pages.
+
+Cached entries are keyed on a per-group "generation" number (meowls,
+leaderboard, comments:<meowl id>). signals.py bumps a group's generation
+when a row it depends on changes, which retires every page and template
+fragment built from it at once without having to know their keys.
+"""
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+
+
+def _gen_key(group: str) -> str:
+    return f"meowls:gen:{group}"
+
+
+def generation(group: str) -> int:
+    """
+    Current generation of `group`. Starts from the clock rather than 1 so
+    an evicted counter can't come back to a number old entries still use.
+    """
+    key = _gen_key(group)
+    gen = cache.get(key)
+    if gen is None:
+        cache.add(key, time.time_ns() // 1000, None)
+        gen = cache.get(key)
+    return gen
+
+
+def bump(*groups: str) -> None:
+    for group in groups:
+        key = _gen_key(group)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns() // 1000, None)
+
+
+def cache_anonymous(*groups: str, timeout: int | None = None):
+    """
+    Serve whole GET responses to anonymous visitors from the cache until
+    one of `groups` is bumped (or `timeout`, PAGE_CACHE_SECONDS by default,
+    passes). Logged-in users always get a fresh render, since the nav,
+    messages and staff controls are per user.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD") or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+            # pending flash messages are rendered into the page; don't cache those
+            if len(get_messages(request)):
+                return view(request, *args, **kwargs)
+
+            gens = ".".join(str(generation(g)) for g in groups)
+            key = f"meowls:page:{request.get_full_path()}:{gens}"
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.cookies and not response.streaming:
+                if hasattr(response, "render"):
+                    response.render()
+                cache.set(key, response, settings.PAGE_CACHE_SECONDS if timeout is None else timeout)
+            return response
+        return wrapper
+    return decorator
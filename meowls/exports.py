@@ -0,0 +1,158 @@
+# meowls/exports.py
+"""
+Streaming CSV/NDJSON exports of the append-only tables (scans, points
+ledger, audit log) for analytics, in constant memory.
+
+Rows come out of values_list() in id order, never as model instances, and
+are written out as they're read. The table is walked in keyset batches
+(id > last, EXPORT_CHUNK_SIZE at a time) with each batch read through
+.iterator(chunk_size=...): SQLite and Postgres stream either way, but
+mysqlclient buffers a whole result set client-side, so a single query over
+millions of MariaDB rows would not be constant memory.
+
+Filters: created_at in [start, end) and id > since_id. Ids only grow, so
+an incremental consumer passes the last id it saw as since_id next time.
+"""
+import csv
+import json
+from datetime import datetime, time
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from . import audit
+from .models import AuditLog, PointsLedger, Scan
+
+FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# name -> (model, columns as (header, values_list field))
+EXPORTS = {
+    "scans": (Scan, (
+        ("id", "id"),
+        ("created_at", "created_at"),
+        ("day", "day"),
+        ("meowl", "meowl__slug"),
+        ("user", "user__username"),
+        ("user_agent", "user_agent"),
+        ("ip_hash", "ip_hash"),
+    )),
+    "ledger": (PointsLedger, (
+        ("id", "id"),
+        ("created_at", "created_at"),
+        ("user", "user__username"),
+        ("meowl", "meowl__slug"),
+        ("points", "points"),
+        ("reason", "reason"),
+    )),
+    "audit": (AuditLog, (
+        ("id", "id"),
+        ("created_at", "created_at"),
+        ("action", "action"),
+        ("actor", "actor__username"),
+        ("target_user", "target_user__username"),
+        ("meowl", "meowl__slug"),
+        ("comment_id", "comment_id"),
+        ("detail", "detail"),
+    )),
+}
+
+LINES_PER_CHUNK = 500  # rows per yielded piece of output
+
+
+class ExportError(ValueError):
+    pass
+
+
+def parse_moment(value: str | None, name: str) -> datetime | None:
+    """
+    An ISO date (local midnight) or datetime (local time if naive).
+    """
+    if not value:
+        return None
+    try:
+        moment = parse_datetime(value)
+        if moment is None and (day := parse_date(value)) is not None:
+            moment = datetime.combine(day, time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ExportError(f"{name} must be a date (YYYY-MM-DD) or ISO datetime")
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+def rows(name: str, start=None, end=None, since_id: int | None = None, chunk_size: int | None = None):
+    """
+    Tuples for export `name`, in id order, in keyset batches.
+    """
+    model, columns = EXPORTS[name]
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    if model is AuditLog:
+        audit.flush()  # include actions still buffered in this process
+
+    qs = model.objects.all()
+    if start is not None:
+        qs = qs.filter(created_at__gte=start)
+    if end is not None:
+        qs = qs.filter(created_at__lt=end)
+    qs = qs.order_by("id").values_list(*(field for _header, field in columns))
+
+    last = since_id or 0
+    while True:
+        n = 0
+        for row in qs.filter(id__gt=last)[:chunk_size].iterator(chunk_size=chunk_size):
+            yield row
+            n += 1
+        if n < chunk_size:
+            return
+        last = row[0]
+
+
+class _Echo:
+    # csv.writer target that hands back the line instead of storing it
+    def write(self, value):
+        return value
+
+
+def _value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def iter_csv(name: str, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([header for header, _field in EXPORTS[name][1]])
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow([_value(v) for v in row]))
+        if len(lines) >= LINES_PER_CHUNK:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def iter_ndjson(name: str, rows):
+    headers = [header for header, _field in EXPORTS[name][1]]
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_value).encode
+    lines = []
+    for row in rows:
+        lines.append(dumps(dict(zip(headers, row))) + "\n")
+        if len(lines) >= LINES_PER_CHUNK:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+SERIALIZERS = {"csv": iter_csv, "ndjson": iter_ndjson}
+
+
+def export(name: str, fmt: str, start=None, end=None, since_id=None):
+    """
+    Text chunks of export `name` in `fmt` ("csv" or "ndjson").
+    """
+    if name not in EXPORTS:
+        raise ExportError(f"unknown export {name!r} (choose from {', '.join(EXPORTS)})")
+    if fmt not in SERIALIZERS:
+        raise ExportError(f"unknown format {fmt!r} (choose from {', '.join(SERIALIZERS)})")
+    return SERIALIZERS[fmt](name, rows(name, start, end, since_id))
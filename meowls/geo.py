@@ -0,0 +1,204 @@
+# meowls/geo.py
+"""
+Geohash grid cells and proximity helpers for MeowlLocation, without PostGIS.
+
+Each location stores its geohash (saved by MeowlLocation.save). A geohash
+prefix is a rectangular cell, and every point inside it has a geohash that
+sorts between `prefix` and `prefix + "~"`, so a viewport becomes a handful
+of plain index range scans on that column. Exact bounds and distances are
+then checked on the (small) candidate set.
+"""
+import math
+
+from django.db.models import Q
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9  # ~5m cells; longer than anything we query with
+EARTH_RADIUS_M = 6_371_008.8
+MAX_CELLS = 24  # cells per bbox query before we drop to coarser ones
+
+
+def encode(lat: float, lng: float, precision: int = PRECISION) -> str:
+    lat_lo, lat_hi, lng_lo, lng_hi = -90.0, 90.0, -180.0, 180.0
+    out, bits, ch, even = [], 0, 0, True
+    while len(out) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            ch = ch << 1 | (lng >= mid)
+            lng_lo, lng_hi = (mid, lng_hi) if lng >= mid else (lng_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            ch = ch << 1 | (lat >= mid)
+            lat_lo, lat_hi = (mid, lat_hi) if lat >= mid else (lat_lo, mid)
+        even = not even
+        bits += 1
+        if bits == 5:
+            out.append(BASE32[ch])
+            bits, ch = 0, 0
+    return "".join(out)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """
+    (height, width) in degrees of a geohash cell.
+    """
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def cover(south: float, west: float, north: float, east: float) -> list[str]:
+    """
+    Geohash prefixes whose cells together cover the box, as long as
+    possible while staying within MAX_CELLS. A box crossing the
+    antimeridian (west > east) is split in two.
+    """
+    if west > east:
+        return cover(south, west, north, 180.0) + cover(south, -180.0, north, east)
+    south, north = max(south, -90.0), min(north, 90.0)
+    for precision in range(PRECISION - 1, 0, -1):
+        height, width = cell_size(precision)
+        rows = range(math.floor((south + 90) / height), math.floor((min(north, 89.999999) + 90) / height) + 1)
+        cols = range(math.floor((west + 180) / width), math.floor((min(east, 179.999999) + 180) / width) + 1)
+        if len(rows) * len(cols) <= MAX_CELLS:
+            return sorted({
+                encode(-90 + (r + 0.5) * height, -180 + (c + 0.5) * width, precision)
+                for r in rows for c in cols
+            })
+    return [""]  # the whole world
+
+
+def cells_q(cells: list[str], field: str = "geohash") -> Q:
+    # prefix match as a range, so both SQLite and MariaDB use the index
+    q = Q()
+    for cell in cells:
+        q |= Q(**{f"{field}__gte": cell, f"{field}__lt": cell + "~"})
+    return q
+
+
+def bbox_q(south: float, west: float, north: float, east: float, prefix: str = "") -> Q:
+    """
+    Locations (fields under `prefix`, e.g. "current_location__") inside the box.
+    """
+    q = cells_q(cover(south, west, north, east), f"{prefix}geohash") & Q(**{f"{prefix}lat__range": (south, north)})
+    if west <= east:
+        return q & Q(**{f"{prefix}lng__range": (west, east)})
+    return q & (Q(**{f"{prefix}lng__gte": west}) | Q(**{f"{prefix}lng__lte": east}))
+
+
+def around(lat: float, lng: float, radius_m: float) -> tuple[float, float, float, float]:
+    """
+    (south, west, north, east) of a box containing the circle.
+    """
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    south, north = lat - dlat, lat + dlat
+    if south <= -90 or north >= 90:
+        return max(south, -90.0), -180.0, min(north, 90.0), 180.0
+    dlng = math.degrees(radius_m / (EARTH_RADIUS_M * math.cos(math.radians(max(abs(south), abs(north))))))
+    if dlng >= 180:
+        return south, -180.0, north, 180.0
+    west, east = lng - dlng, lng + dlng
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return south, west, north, east
+
+
+def distances(lat: float, lng: float, points: list[tuple[float, float]]) -> list[float]:
+    """
+    Haversine distance in metres from (lat, lng) to each point, in one pass
+    with the origin's trig hoisted out of the loop.
+    """
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    cos1 = math.cos(lat1)
+    sin, cos, asin, sqrt, radians = math.sin, math.cos, math.asin, math.sqrt, math.radians
+    out = []
+    for plat, plng in points:
+        lat2 = radians(plat)
+        a = sin((lat2 - lat1) / 2) ** 2 + cos1 * cos(lat2) * sin((radians(plng) - lng1) / 2) ** 2
+        out.append(2 * EARTH_RADIUS_M * asin(min(1.0, sqrt(a))))
+    return out
+
+
+def nearest(qs, lat: float, lng: float, k: int, prefix: str = "", point=None, box=None,
+            start_m: float = 500.0) -> list[tuple]:
+    """
+    k nearest rows of `qs` to (lat, lng) as (distance_m, row), nearest first.
+    `point(row)` gives a row's (lat, lng); by default it follows `prefix`
+    on model instances. `box(qs, south, west, north, east)` narrows `qs`
+    to a box (default: filter on bbox_q). The search box grows until k rows
+    fall within the circle it contains, which guarantees nothing outside
+    it is closer.
+    """
+    point = point or (lambda row: _latlng(row, prefix))
+    box = box or (lambda qs, *bounds: qs.filter(bbox_q(*bounds, prefix=prefix)))
+    radius = start_m
+    while True:
+        rows = list(box(qs, *around(lat, lng, radius)))
+        points = [point(row) for row in rows]
+        found = sorted(zip(distances(lat, lng, points), range(len(rows))))
+        within = [(d, i) for d, i in found if d <= radius]
+        if len(within) >= k or radius >= math.pi * EARTH_RADIUS_M:
+            picked = within if len(within) >= k else found
+            return [(d, rows[i]) for d, i in picked[:k]]
+        radius *= 4
+
+
+def _latlng(row, prefix: str) -> tuple[float, float]:
+    obj = row
+    for part in filter(None, prefix.split("__")):
+        obj = getattr(obj, part)
+    return obj.lat, obj.lng
+
+
+# --- slippy-map tiles (z/x/y, Web Mercator) ---
+
+MAX_ZOOM = 22
+
+
+def _mercator(lat: float, lng: float, z: int) -> tuple[float, float]:
+    """
+    Fractional tile coordinates of a point at zoom z.
+    """
+    n = 2 ** z
+    lat = max(min(lat, 85.0511), -85.0511)
+    tx = (lng + 180.0) / 360.0 * n
+    ty = (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+    return tx, ty
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """
+    (south, west, north, east) of a tile.
+    """
+    n = 2 ** z
+
+    def lat(ty):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return lat(y + 1), x / n * 360.0 - 180.0, lat(y), (x + 1) / n * 360.0 - 180.0
+
+
+def cluster(rows, z: int, x: int, y: int, grid: int) -> list[dict]:
+    """
+    Bucket `rows` (dicts with lat/lng) on a grid x grid raster over the
+    tile. Buckets with one row come back as that row; bigger ones as
+    {"count", "lat", "lng"} at their centroid.
+    """
+    buckets: dict[tuple[int, int], list] = {}
+    for row in rows:
+        tx, ty = _mercator(row["lat"], row["lng"], z)
+        cell = (min(max(int((tx - x) * grid), 0), grid - 1), min(max(int((ty - y) * grid), 0), grid - 1))
+        buckets.setdefault(cell, []).append(row)
+    out = []
+    for members in buckets.values():
+        if len(members) == 1:
+            out.append(members[0])
+        else:
+            out.append({
+                "count": len(members),
+                "lat": sum(m["lat"] for m in members) / len(members),
+                "lng": sum(m["lng"] for m in members) / len(members),
+            })
+    return out
@@ -0,0 +1,130 @@
+# meowls/jobs.py
+"""
+Tiny database-backed job queue for poster renders.
+
+Web requests only enqueue (`enqueue_poster`); `manage.py poster_worker`
+claims queued rows and renders them in a process pool, writing the result
+into the poster cache where pdf_file picks it up.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.utils.timezone import now
+
+from .models import PosterJob
+
+ACTIVE = ("queued", "running")
+RETRY_MAX_SECONDS = 3600  # longest wait between retries of a failing render
+
+
+def enqueue_poster(meowl, user=None) -> PosterJob:
+    """
+    Queue a render for `meowl` unless one is already waiting or running.
+    Two concurrent polls can't both queue one: the loser's insert hits the
+    unique in_flight column and it returns the winner's job instead.
+    """
+    active = PosterJob.objects.filter(meowl=meowl, status__in=ACTIVE).order_by("-created_at")
+    job = active.first()
+    if job is None:
+        try:
+            with transaction.atomic():
+                job = PosterJob.objects.create(
+                    meowl=meowl,
+                    in_flight=meowl.pk,
+                    requested_by=user if user and user.is_authenticated else None,
+                )
+        except IntegrityError:
+            job = active.first() or latest_job(meowl)
+    return job
+
+
+def latest_job(meowl) -> PosterJob | None:
+    return PosterJob.objects.filter(meowl=meowl).order_by("-created_at", "-id").first()
+
+
+def requeue_stale(timeout_seconds: int | None = None) -> int:
+    """
+    Put back jobs whose worker died mid-render.
+    """
+    if timeout_seconds is None:
+        timeout_seconds = settings.POSTER_JOB_TIMEOUT
+    cutoff = now() - timedelta(seconds=timeout_seconds)
+    return PosterJob.objects.filter(status="running", started_at__lt=cutoff).update(
+        status="queued", started_at=None
+    )
+
+
+def claim_jobs(limit: int) -> list[int]:
+    """
+    Atomically flip up to `limit` queued jobs to running and return their ids.
+    The conditional UPDATE makes concurrent workers skip each other's rows
+    without needing SELECT ... FOR UPDATE SKIP LOCKED (SQLite has none).
+    """
+    claimed = []
+    candidates = (
+        PosterJob.objects.filter(status="queued")
+        .order_by("created_at", "id")
+        .values_list("id", flat=True)[: limit * 2]
+    )
+    for job_id in candidates:
+        if len(claimed) >= limit:
+            break
+        if PosterJob.objects.filter(pk=job_id, status="queued").update(status="running", started_at=now()):
+            claimed.append(job_id)
+    return claimed
+
+
+def run_job(job_id: int) -> str:
+    """
+    Render one job. Runs inside a pool process; returns the final status.
+    """
+    from .pdf import build_meowl_pdf
+    from .poster_cache import get_poster
+
+    job = PosterJob.objects.select_related("meowl").get(pk=job_id)
+    try:
+        get_poster(job.meowl, build_meowl_pdf).file.close()
+    except Exception as exc:
+        PosterJob.objects.filter(pk=job_id).update(status="failed", error=repr(exc), finished_at=now(), in_flight=None)
+        return "failed"
+    PosterJob.objects.filter(pk=job_id).update(status="done", error="", finished_at=now(), in_flight=None)
+    return "done"
+
+
+def init_worker() -> None:
+    # forked children must not share the parent's DB sockets
+    connections.close_all()
+
+
+def poster_status(meowl, user=None) -> str:
+    """
+    "done" if a fresh poster is on disk, otherwise the state of its render job
+    (queueing one if there's nothing in flight).
+    """
+    from .poster_cache import has_fresh_poster
+
+    if has_fresh_poster(meowl):
+        return "done"
+    job = latest_job(meowl)
+    # never rendered, the render has expired, or a failed one is due a retry
+    if job is None or job.status == "done" or (job.status == "failed" and _retry_due(job)):
+        job = enqueue_poster(meowl, user)
+    return job.status
+
+
+def _retry_due(job: PosterJob) -> bool:
+    """
+    Has this failed render waited out its backoff? POSTER_JOB_RETRY_SECONDS
+    after the first failure in a row, doubling with each one after that,
+    up to RETRY_MAX_SECONDS.
+    """
+    failures = PosterJob.objects.filter(meowl_id=job.meowl_id, status="failed")
+    last_done = (
+        PosterJob.objects.filter(meowl_id=job.meowl_id, status="done")
+        .order_by("-created_at").values_list("created_at", flat=True).first()
+    )
+    if last_done is not None:
+        failures = failures.filter(created_at__gt=last_done)
+    delay = min(settings.POSTER_JOB_RETRY_SECONDS * 2 ** max(failures.count() - 1, 0), RETRY_MAX_SECONDS)
+    return job.finished_at is None or now() - job.finished_at >= timedelta(seconds=delay)
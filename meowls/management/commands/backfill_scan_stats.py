@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from meowls.models import Meowl
+
+
+class Command(BaseCommand):
+    help = "Recompute Meowl.last_scanned_at and scan_count from the Scan table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("slugs", nargs="*", help="Only these Meowls (default: all).")
+
+    def handle(self, *args, slugs, **options):
+        meowls = Meowl.objects.all()
+        if slugs:
+            meowls = meowls.filter(slug__in=slugs)
+        updated = meowls.refresh_scan_stats()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed scan stats for {updated} Meowls."))
@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from meowls import bench
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the main pages with concurrent test-client workers and print "
+        "p50/p95/p99 latency, queries per request and throughput as JSON. "
+        "Runs against a throwaway test database seeded with --scale unless --current-db."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=float, default=1.0, help="Dataset size (see seed_bench).")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per path.")
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent client threads.")
+        parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per path first.")
+        parser.add_argument("--paths", default=",".join(bench.PATHS), help="Comma-separated subset of paths.")
+        parser.add_argument("--current-db", action="store_true",
+                            help="Use the configured database as-is (already seeded with seed_bench).")
+        parser.add_argument("--output", help="Also write the JSON report to this file.")
+
+    def handle(self, *args, scale, requests, workers, warmup, paths, current_db, output, **options):
+        paths = [p for p in paths.split(",") if p]
+        unknown = set(paths) - set(bench.PATHS)
+        if unknown:
+            raise CommandError(f"Unknown paths: {', '.join(sorted(unknown))} (choose from {', '.join(bench.PATHS)})")
+
+        db = settings.DATABASES["default"]
+        if not current_db and db["ENGINE"].endswith("sqlite3"):
+            # in-memory SQLite locks whole tables between threads; a file
+            # with a busy timeout behaves more like the real thing
+            db["TEST"] = {**db.get("TEST", {}), "NAME": os.path.join(tempfile.gettempdir(), "meowl_bench.sqlite3")}
+            db.setdefault("OPTIONS", {}).setdefault("timeout", 20)
+
+        setup_test_environment()
+        old_config = None if current_db else setup_databases(verbosity=0, interactive=False)
+        try:
+            if current_db:
+                dataset = {"scale": None}
+            else:
+                start = time.perf_counter()
+                dataset = {"scale": scale, **bench.seed(scale), "seed_seconds": round(time.perf_counter() - start, 2)}
+            results = bench.run(paths, requests=requests, workers=workers, warmup=warmup)
+        finally:
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "database": settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1],
+            "cache": settings.CACHES["default"]["BACKEND"].rsplit(".", 1)[-1],
+            "workers": workers,
+            "dataset": dataset,
+            "paths": results,
+        }
+        text = json.dumps(report, indent=2)
+        if output:
+            with open(output, "w") as f:
+                f.write(text + "\n")
+        self.stdout.write(text)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from meowls.templatetags.qr import qr_image
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark QR generation: PNG vs SVG, cold vs cached."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", type=int, default=200, help="QRs per case.")
+
+    def handle(self, *args, n, **options):
+        # roughly what build_meowl_pdf encodes
+        payloads = [f"{settings.SITE_URL}/meowls/meowl-{i}/?t=meowl-{i}:1tQb2x:{'x' * 43}" for i in range(n)]
+        for fmt in ("png", "svg"):
+            qr_image.cache_clear()
+            start = time.perf_counter()
+            for data in payloads:
+                qr_image(data, fmt=fmt)
+            cold = (time.perf_counter() - start) / n
+
+            start = time.perf_counter()
+            for data in payloads:
+                qr_image(data, fmt=fmt)
+            cached = (time.perf_counter() - start) / n
+
+            size = sum(len(qr_image(data, fmt=fmt)) for data in payloads) // n
+            self.stdout.write(
+                f"{fmt}: cold {cold * 1e3:.3f} ms/qr, cached {cached * 1e6:.2f} us/qr, {size} bytes"
+            )
+        qr_image.cache_clear()
@@ -0,0 +1,74 @@
+import time
+
+import qrcode
+from qrcode.constants import ERROR_CORRECT_M
+from django.conf import settings
+from django.core import signing
+from django.core.management.base import BaseCommand
+
+from meowls import tokens
+
+
+def _old_make(slug):
+    # tokens.py before the compact format: a new signer every call
+    return signing.TimestampSigner().sign(slug)
+
+
+def _old_check(token, slug):
+    try:
+        return signing.TimestampSigner().unsign(token, max_age=settings.QR_TOKEN_MINUTES * 60) == slug
+    except signing.BadSignature:
+        return False
+
+
+def _qr_version(data: str) -> int:
+    qr = qrcode.QRCode(error_correction=ERROR_CORRECT_M)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.version
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark QR token signing/verification: old per-call signer vs reused signer vs compact, cold vs cached."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", type=int, default=20000, help="Operations per case.")
+
+    def _time(self, label, fn, args, n):
+        start = time.perf_counter()
+        for a in args:
+            fn(*a)
+        per = (time.perf_counter() - start) / n
+        self.stdout.write(f"  {label:<34} {per * 1e6:8.2f} us/op")
+
+    def handle(self, *args, n, **options):
+        slugs = [f"meowl-{i % 500}" for i in range(n)]
+        old = [(_old_make(s), s) for s in slugs]
+        signed = [(tokens.make_qr_token(s, fmt="signed"), s) for s in slugs]
+        compact = [(tokens.make_qr_token(s, fmt="compact"), s) for s in slugs]
+
+        def cold(token, slug):
+            tokens.verified.clear()
+            return tokens.verify_qr_token(token, slug)
+
+        self.stdout.write("make:")
+        self._time("old (new signer per call)", _old_make, [(s,) for s in slugs], n)
+        self._time("signed (reused signer)", lambda s: tokens.make_qr_token(s, fmt="signed"), [(s,) for s in slugs], n)
+        self._time("compact", lambda s: tokens.make_qr_token(s, fmt="compact"), [(s,) for s in slugs], n)
+
+        self.stdout.write("verify:")
+        self._time("old check_qr_token", _old_check, old, n)
+        self._time("signed, cold", cold, signed, n)
+        self._time("compact, cold", cold, compact, n)
+        tokens.verified.clear()
+        for case in (signed, compact):
+            for token, slug in case[:500]:
+                tokens.verify_qr_token(token, slug)
+        self._time("signed, cached", tokens.verify_qr_token, signed, n)
+        self._time("compact, cached", tokens.verify_qr_token, compact, n)
+        tokens.verified.clear()
+
+        self.stdout.write("poster URL (QR error correction M):")
+        for label, (token, slug) in (("signed", signed[0]), ("compact", compact[0])):
+            url = f"{settings.SITE_URL}/meowls/{slug}/?t={token}"
+            self.stdout.write(f"  {label:<8} {len(url):3d} chars, QR version {_qr_version(url)}  {url}")
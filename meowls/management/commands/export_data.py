@@ -0,0 +1,35 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meowls import exports
+
+
+class Command(BaseCommand):
+    help = "Stream scans, points ledger or audit log rows as CSV or NDJSON (same as the staff export)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(exports.EXPORTS))
+        parser.add_argument("--format", default="csv", choices=list(exports.FORMATS))
+        parser.add_argument("--start", help="Rows created at or after this date/datetime.")
+        parser.add_argument("--end", help="Rows created before this date/datetime.")
+        parser.add_argument("--since-id", type=int, help="Only rows with a larger id (incremental pulls).")
+        parser.add_argument("-o", "--output", help="File to write (default: stdout).")
+
+    def handle(self, *args, dataset, format, start, end, since_id, output, **options):
+        try:
+            chunks = exports.export(
+                dataset, format,
+                start=exports.parse_moment(start, "--start"),
+                end=exports.parse_moment(end, "--end"),
+                since_id=since_id,
+            )
+            out = open(output, "w", newline="", encoding="utf-8") if output else sys.stdout
+            try:
+                for chunk in chunks:
+                    out.write(chunk)
+            finally:
+                if output:
+                    out.close()
+        except exports.ExportError as e:
+            raise CommandError(str(e))
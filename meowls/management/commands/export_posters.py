@@ -0,0 +1,38 @@
+from datetime import datetime, time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from meowls import bulk
+
+
+class Command(BaseCommand):
+    help = "Render many posters into one multi-page PDF or a ZIP of PDFs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("slugs", nargs="*", help="Meowl slugs (default: every active Meowl).")
+        parser.add_argument("--owner", help="Only Meowls owned by this username.")
+        parser.add_argument("--since", help="Only Meowls created on or after this date (YYYY-MM-DD).")
+        parser.add_argument("--include-archived", action="store_true")
+        parser.add_argument("--format", choices=("pdf", "zip"), default="pdf")
+        parser.add_argument("--output", "-o", help="Output file (default: meowl-posters.<format>).")
+        parser.add_argument("--workers", type=int, default=settings.POSTER_WORKERS)
+
+    def handle(self, *args, slugs, owner, since, include_archived, format, output, workers, **options):
+        if since:
+            try:
+                since = timezone.make_aware(datetime.combine(datetime.strptime(since, "%Y-%m-%d").date(), time.min))
+            except ValueError:
+                raise CommandError("--since must look like YYYY-MM-DD")
+
+        meowls = list(bulk.select_meowls(slugs, owner, since, include_archived))
+        if not meowls:
+            raise CommandError("No Meowls match.")
+
+        output = output or f"meowl-posters.{format}"
+        chunks = bulk.iter_posters_zip(meowls, workers) if format == "zip" else bulk.iter_posters_pdf(meowls, workers)
+        with open(output, "wb") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(meowls)} posters to {output}"))
@@ -0,0 +1,33 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from meowls.jobs import claim_jobs, init_worker, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = "Render queued poster jobs in a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=settings.POSTER_WORKERS)
+        parser.add_argument("--poll", type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain the queue and exit.")
+
+    def handle(self, *args, workers, poll, once, **options):
+        workers = max(1, workers)
+        # close before forking so children open their own connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            while True:
+                requeue_stale()
+                job_ids = claim_jobs(workers)
+                if not job_ids:
+                    if once:
+                        return
+                    time.sleep(poll)
+                    continue
+                for job_id, status in zip(job_ids, pool.map(run_job, job_ids)):
+                    self.stdout.write(f"job {job_id}: {status}")
@@ -0,0 +1,86 @@
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+from meowls import bench, querybudget
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every view on a throwaway database seeded at two sizes and check "
+        "its SQL query count against querybudget.BUDGETS; the count must not grow "
+        "with the data. Prints duplicated statements and where they came from."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="0.01,1",
+                            help="Two (or more) dataset sizes, comma-separated (see seed_bench).")
+        parser.add_argument("--case", action="append", dest="cases", help="Only this case (repeatable).")
+        parser.add_argument("--show-queries", action="store_true", help="Print every query of failing cases.")
+
+    def handle(self, *args, scales, cases, show_queries, **options):
+        scales = [float(s) for s in scales.split(",")]
+        known = [name for name, _role, _url in querybudget.CASES]
+        if unknown := set(cases or ()) - set(known):
+            raise CommandError(f"Unknown cases: {', '.join(sorted(unknown))}")
+
+        runs = {}
+        setup_test_environment()
+        try:
+            for scale in scales:
+                with tempfile.TemporaryDirectory() as media, override_settings(
+                    # the run empties the cache after every request; keep it away from a shared one
+                    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+                    MEDIA_ROOT=media,  # no posters left over from the previous size
+                    AUDIT_SYNC=False,
+                    PROFILING=False,
+                ):
+                    old_config = setup_databases(verbosity=0, interactive=False)
+                    try:
+                        bench.seed(scale)
+                        runs[scale] = querybudget.measure(cases)
+                    finally:
+                        teardown_databases(old_config, verbosity=0)
+        finally:
+            teardown_test_environment()
+
+        failures = []
+        self.stdout.write(f"{'case':<26}" + "".join(f"{s:>8g}" for s in scales) + f"{'budget':>8}")
+        for name in runs[scales[0]]:
+            results = [runs[s][name] for s in scales]
+            counts = [len(capture.queries) for _status, capture in results]
+            budget = querybudget.BUDGETS.get(name)
+            problems = []
+            if errors := {status for status, _capture in results if status >= 400}:
+                problems.append(f"HTTP {', '.join(map(str, sorted(errors)))}")
+            if len(set(counts)) > 1 and name not in querybudget.DATA_DEPENDENT:
+                problems.append("grows with the data")
+            if budget is None:
+                problems.append("no budget")
+            elif max(counts) > budget:
+                problems.append("over budget")
+            line = f"{name:<26}" + "".join(f"{n:>8}" for n in counts) + f"{budget if budget is not None else '-':>8}"
+            if problems:
+                failures.append((name, results[-1][1]))
+                self.stdout.write(self.style.ERROR(f"{line}  {'; '.join(problems)}"))
+            elif max(counts) < budget:
+                self.stdout.write(f"{line}  ok (budget could be {max(counts)})")
+            else:
+                self.stdout.write(f"{line}  ok")
+
+        for name, capture in failures:
+            self.stdout.write(f"\n{name} at scale {scales[-1]:g}: {len(capture.queries)} queries")
+            for times, sql, origins in capture.duplicates():
+                self.stdout.write(f"  {times}x {sql}")
+                for origin, n in origins.most_common():
+                    self.stdout.write(f"       {n}x from {origin}")
+            if show_queries:
+                for sql, origin in capture.queries:
+                    self.stdout.write(f"  - {sql}\n      from {origin}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} case(s) failed their query budget.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(runs[scales[0]])} cases within budget."))
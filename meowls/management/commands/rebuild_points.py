@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from meowls.models import DailyPoints, UserPoints
+from meowls.utils import ledger_rollups, rebuild_points
+
+
+class Command(BaseCommand):
+    help = "Rebuild the UserPoints/DailyPoints rollups from PointsLedger (or just compare with --check)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Report drift without writing anything.")
+
+    def handle(self, *args, check, **options):
+        if not check:
+            users, days = rebuild_points()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {users} user totals and {days} daily buckets."))
+            return
+
+        totals, daily = ledger_rollups()
+        stored = dict(UserPoints.objects.values_list("user_id", "total"))
+        stored_daily = {(uid, day): p for uid, day, p in DailyPoints.objects.values_list("user_id", "day", "points")}
+
+        drift = 0
+        for uid in totals.keys() | stored.keys():
+            if totals.get(uid, 0) != stored.get(uid, 0):
+                drift += 1
+                self.stdout.write(f"user {uid}: ledger {totals.get(uid, 0)}, rollup {stored.get(uid, 0)}")
+        for key in daily.keys() | stored_daily.keys():
+            if daily.get(key, 0) != stored_daily.get(key, 0):
+                drift += 1
+                self.stdout.write(f"user {key[0]} on {key[1]}: ledger {daily.get(key, 0)}, rollup {stored_daily.get(key, 0)}")
+
+        if drift:
+            self.stdout.write(self.style.WARNING(f"{drift} rollups drifted; run without --check to rebuild."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Rollups match the ledger."))
@@ -0,0 +1,22 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from meowls import bench
+
+
+class Command(BaseCommand):
+    help = "Bulk-insert a synthetic dataset (bench-* users and Meowls) into the current database."
+
+    def add_arguments(self, parser):
+        per_scale = ", ".join(f"{v} {k}" for k, v in bench.PER_SCALE.items())
+        parser.add_argument("--scale", type=float, default=1.0, help=f"Multiplier on {per_scale}.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for repeatable data.")
+        parser.add_argument("--prefix", default="bench", help="Username/slug prefix.")
+
+    def handle(self, *args, scale, seed, prefix, **options):
+        if User.objects.filter(username=f"{prefix}-staff").exists():
+            raise CommandError(f"A {prefix!r} dataset is already here; pick another --prefix.")
+        counts = bench.seed(scale, seed, prefix)
+        self.stdout.write(self.style.SUCCESS(
+            "Seeded " + ", ".join(f"{n} {name}" for name, n in counts.items()) + "."
+        ))
@@ -0,0 +1,217 @@
+# meowls/metrics.py
+"""
+Opt-in request profiling (PROFILING=1).
+
+ProfilingMiddleware times every request and, per view name, records wall
+time, SQL query count, DB time (through connection execute wrappers),
+template render time and PDF build time (pdf.build_meowl_pdf) into
+in-process histograms. Staff can scrape them in Prometheus text format at
+admin/metrics/. Requests slower than SLOW_REQUEST_MS are logged to the
+"meowls.slow" logger together with their slowest queries.
+
+Histograms live in process memory: each worker reports its own, and they
+reset on restart. Without PROFILING the middleware removes itself and
+timed() costs a context variable lookup.
+"""
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("meowls.slow")
+
+SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERIES = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+MAX_CAPTURED_QUERIES = 200
+
+METRICS = {
+    # name: (help, buckets)
+    "meowl_request_seconds": ("Wall time per request.", SECONDS),
+    "meowl_request_sql_queries": ("SQL queries per request.", QUERIES),
+    "meowl_request_db_seconds": ("Time spent in SQL per request.", SECONDS),
+    "meowl_request_template_seconds": ("Template render time per request.", SECONDS),
+    "meowl_pdf_build_seconds": ("Poster PDF build time (build_meowl_pdf).", SECONDS),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_histograms: dict[tuple[str, str], Histogram] = {}
+
+
+def observe(name: str, view: str, value: float) -> None:
+    with _lock:
+        hist = _histograms.get((name, view))
+        if hist is None:
+            hist = _histograms[name, view] = Histogram(METRICS[name][1])
+        hist.observe(value)
+
+
+@dataclass
+class RequestStats:
+    view: str = "-"
+    sql_count: int = 0
+    db_time: float = 0.0
+    template_time: float = 0.0
+    pdf_time: float = 0.0
+    queries: list = field(default_factory=list)  # (seconds, sql)
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("meowls_request_stats", default=None)
+
+
+@contextmanager
+def timed(name: str):
+    """
+    Time a block into histogram `name` (labelled with the current view, or
+    "-" outside a request) and the current request's totals. A no-op
+    unless PROFILING is on.
+    """
+    if not settings.PROFILING:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stats = _current.get()
+        if stats is not None and name == "meowl_pdf_build_seconds":
+            stats.pdf_time += elapsed
+        observe(name, stats.view if stats else "-", elapsed)
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if stats is not None:
+            elapsed = time.perf_counter() - start
+            stats.sql_count += 1
+            stats.db_time += elapsed
+            if len(stats.queries) < MAX_CAPTURED_QUERIES:
+                stats.queries.append((elapsed, sql))
+
+
+_patched = False
+
+
+def _patch_template_render() -> None:
+    """
+    Time top-level template renders. Includes and {% extends %} go through
+    the engine's own Template, so each render() is counted once.
+    """
+    global _patched
+    if _patched:
+        return
+    from django.template.backends.django import Template
+
+    original = Template.render
+
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        start = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            if stats is not None:
+                stats.template_time += time.perf_counter() - start
+
+    Template.render = render
+    _patched = True
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _patch_template_render()
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(_sql_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        wall = time.perf_counter() - start
+
+        view = stats.view
+        observe("meowl_request_seconds", view, wall)
+        observe("meowl_request_sql_queries", view, stats.sql_count)
+        observe("meowl_request_db_seconds", view, stats.db_time)
+        observe("meowl_request_template_seconds", view, stats.template_time)
+
+        if wall * 1000 >= settings.SLOW_REQUEST_MS:
+            slowest = sorted(stats.queries, key=lambda q: q[0], reverse=True)[:10]
+            logger.warning(
+                "slow request %s %s (%s): %.0fms, %d queries in %.0fms, templates %.0fms, pdf %.0fms\n%s",
+                request.method, request.get_full_path(), view, wall * 1000,
+                stats.sql_count, stats.db_time * 1000, stats.template_time * 1000, stats.pdf_time * 1000,
+                "\n".join(f"  {secs * 1000:7.1f}ms  {sql}" for secs, sql in slowest),
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # known from here on, so timed() blocks inside the view get the label
+        stats = _current.get()
+        if stats is not None:
+            stats.view = request.resolver_match.view_name
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    """
+    All histograms in the Prometheus text exposition format.
+    """
+    with _lock:
+        snapshot = {
+            key: (list(h.counts), h.sum, h.count, h.buckets) for key, h in _histograms.items()
+        }
+    lines = []
+    for name, (help_text, _buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (metric, view), (counts, total, count, buckets) in sorted(snapshot.items()):
+            if metric != name:
+                continue
+            label = f'view="{_label(view)}"'
+            running = 0
+            for bound, n in zip(buckets, counts):
+                running += n
+                lines.append(f'{name}_bucket{{{label},le="{bound}"}} {running}')
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{name}_sum{{{label}}} {total}")
+            lines.append(f"{name}_count{{{label}}} {count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.7 on 2026-10-16 22:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_current_location(apps, schema_editor):
+    Meowl = apps.get_model("meowls", "Meowl")
+    MeowlLocation = apps.get_model("meowls", "MeowlLocation")
+    newest = (
+        MeowlLocation.objects.filter(meowl=models.OuterRef("pk"), status="current")
+        .order_by("-verified_at", "-id")
+        .values("pk")[:1]
+    )
+    Meowl.objects.update(current_location=models.Subquery(newest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meowls', '0006_posterjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meowl',
+            name='current_location',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='meowls.meowllocation'),
+        ),
+        migrations.RunPython(backfill_current_location, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.0.7 on 2026-10-16 22:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_points(apps, schema_editor):
+    PointsLedger = apps.get_model("meowls", "PointsLedger")
+    UserPoints = apps.get_model("meowls", "UserPoints")
+    DailyPoints = apps.get_model("meowls", "DailyPoints")
+    ledger = PointsLedger.objects.order_by()
+    UserPoints.objects.bulk_create(
+        [UserPoints(user_id=row["user_id"], total=row["t"])
+         for row in ledger.values("user_id").annotate(t=Sum("points"))],
+        batch_size=1000,
+    )
+    DailyPoints.objects.bulk_create(
+        [DailyPoints(user_id=row["user_id"], day=row["day"], points=row["p"])
+         for row in ledger.annotate(day=TruncDate("created_at")).values("user_id", "day").annotate(p=Sum("points"))],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('meowls', '0007_meowl_current_location'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserPoints',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='points_total', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-total'], name='userpoints_total_desc')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyPoints',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('points', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day', 'user'], name='dailypoints_day_user')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailypoints',
+            constraint=models.UniqueConstraint(fields=('user', 'day'), name='dailypoints_user_day'),
+        ),
+        migrations.RunPython(backfill_points, migrations.RunPython.noop),
+    ]
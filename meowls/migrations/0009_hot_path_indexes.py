@@ -0,0 +1,39 @@
+# Generated by Django 5.0.7 on 2026-10-16 22:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meowls', '0008_points_totals'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-created_at'], name='auditlog_newest'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['meowl', 'is_hidden', '-created_at'], name='comment_meowl_hidden_newest'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['meowl', '-created_at'], name='comment_meowl_newest'),
+        ),
+        migrations.AddIndex(
+            model_name='meowl',
+            index=models.Index(fields=['owner', 'created_at'], name='meowl_owner_created'),
+        ),
+        migrations.AddIndex(
+            model_name='meowllocation',
+            index=models.Index(fields=['meowl', 'status', '-verified_at', '-id'], name='meowlloc_meowl_status_newest'),
+        ),
+        migrations.AddIndex(
+            model_name='scan',
+            index=models.Index(fields=['meowl', 'user', 'created_at'], name='scan_meowl_user_created'),
+        ),
+    ]
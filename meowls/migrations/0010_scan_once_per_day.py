@@ -0,0 +1,47 @@
+# Generated by Django 5.0.7 on 2026-10-16 22:35
+
+from django.conf import settings
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_scan_day(apps, schema_editor):
+    # Only the first scan per (meowl, user, day) gets a day; earlier duplicates
+    # keep NULL, which the unique constraint ignores.
+    Scan = apps.get_model("meowls", "Scan")
+    seen = set()
+    by_day = defaultdict(list)
+    rows = (Scan.objects.order_by("created_at", "id")
+            .values_list("id", "meowl_id", "user_id", "created_at")
+            .iterator(chunk_size=5000))
+    for scan_id, meowl_id, user_id, created_at in rows:
+        day = timezone.localdate(created_at)
+        if (meowl_id, user_id, day) not in seen:
+            seen.add((meowl_id, user_id, day))
+            by_day[day].append(scan_id)
+    for day, ids in by_day.items():
+        for i in range(0, len(ids), 500):
+            Scan.objects.filter(id__in=ids[i:i + 500]).update(day=day)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meowls', '0009_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scan',
+            name='day',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_scan_day, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='scan',
+            constraint=models.UniqueConstraint(fields=('meowl', 'user', 'day'), name='scan_once_per_day'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.7 on 2026-10-16 22:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_user_status(apps, schema_editor):
+    # was done on every staff_dashboard load; signals.create_user_status covers new users
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    UserStatus = apps.get_model("meowls", "UserStatus")
+    missing = User.objects.filter(status__isnull=True).values_list("id", flat=True)
+    UserStatus.objects.bulk_create(
+        [UserStatus(user_id=uid) for uid in missing.iterator()], batch_size=1000, ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meowls', '0011_auditlog_created_at_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['-created_at', '-id'], name='comment_newest'),
+        ),
+        migrations.AddIndex(
+            model_name='meowl',
+            index=models.Index(fields=['name', 'id'], name='meowl_name_id'),
+        ),
+    ]
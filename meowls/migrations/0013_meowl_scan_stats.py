@@ -0,0 +1,43 @@
+# Generated by Django 5.0.7 on 2026-10-16 22:42
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_scan_stats(apps, schema_editor):
+    # same as MeowlQuerySet.refresh_scan_stats (historical models don't have it)
+    Meowl = apps.get_model("meowls", "Meowl")
+    Scan = apps.get_model("meowls", "Scan")
+    scans = Scan.objects.filter(meowl=OuterRef("pk")).order_by().values("meowl")
+    Meowl.objects.update(
+        last_scanned_at=Subquery(scans.annotate(last=Max("created_at")).values("last")),
+        scan_count=Coalesce(Subquery(scans.annotate(n=Count("pk")).values("n")), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meowls', '0012_dashboard_keyset'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meowl',
+            name='last_scanned_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='meowl',
+            name='scan_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_scan_stats, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='meowl',
+            index=models.Index(fields=['is_archived', 'name'], name='meowl_archived_name'),
+        ),
+    ]
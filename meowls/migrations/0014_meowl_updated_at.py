@@ -0,0 +1,20 @@
+# Generated by Django 5.0.7 on 2026-10-16 22:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meowls', '0013_meowl_scan_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meowl',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.7 on 2026-10-16 22:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+from meowls.geo import encode
+
+
+def backfill_geohash(apps, schema_editor):
+    MeowlLocation = apps.get_model("meowls", "MeowlLocation")
+    batch = []
+    for loc in MeowlLocation.objects.only("id", "lat", "lng").iterator(chunk_size=2000):
+        loc.geohash = encode(loc.lat, loc.lng)
+        batch.append(loc)
+        if len(batch) >= 2000:
+            MeowlLocation.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    MeowlLocation.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meowls', '0014_meowl_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meowllocation',
+            name='geohash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=12),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='meowllocation',
+            index=models.Index(fields=['geohash'], name='meowlloc_geohash'),
+        ),
+    ]
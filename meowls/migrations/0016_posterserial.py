@@ -0,0 +1,35 @@
+# Generated by Django 5.0.7 on 2026-10-16 22:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meowls', '0015_meowllocation_geohash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('comment_hide', 'Hide Comment'), ('comment_unhide', 'Unhide Comment'), ('meowl_archive', 'Archive Meowl'), ('meowl_unarchive', 'Unarchive Meowl'), ('user_promote', 'Promote User'), ('user_demote', 'Demote User'), ('user_suspend', 'Suspend User'), ('user_unsuspend', 'Unsuspend User'), ('poster_reissue', 'Reissue Poster'), ('scan', 'Scan'), ('create', 'Create'), ('verify', 'Verify')], max_length=50),
+        ),
+        migrations.CreateModel(
+            name='PosterSerial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('revoked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('meowl', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='poster_serials', to='meowls.meowl')),
+                ('revoked_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['meowl', 'revoked_at', '-id'], name='posterserial_live')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.7 on 2026-10-16 23:20
+
+from django.db import migrations, models
+
+
+def backfill_in_flight(apps, schema_editor):
+    # Only the newest queued/running job per Meowl is marked; any older
+    # duplicates keep NULL and are still picked up by the worker.
+    PosterJob = apps.get_model("meowls", "PosterJob")
+    newest = {}
+    for job_id, meowl_id in (PosterJob.objects.filter(status__in=("queued", "running"))
+                             .order_by("created_at", "id").values_list("id", "meowl_id")):
+        newest[meowl_id] = job_id
+    for meowl_id, job_id in newest.items():
+        PosterJob.objects.filter(pk=job_id).update(in_flight=meowl_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meowls', '0016_posterserial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='posterjob',
+            name='in_flight',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_in_flight, migrations.RunPython.noop),
+    ]
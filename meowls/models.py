@@ -1,6 +1,58 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.utils import timezone
+
+from . import geo
+
+
+class MeowlQuerySet(models.QuerySet):
+    def with_location(self):
+        """
+        Join the current location in, so `.lat`/`.lng`/`.current_location`
+        cost no extra queries per row.
+        """
+        return self.select_related("current_location")
+
+    def refresh_current_location(self):
+        """
+        Re-point current_location at each Meowl's newest "current" row, in one UPDATE.
+        """
+        newest = (
+            MeowlLocation.objects.filter(meowl=models.OuterRef("pk"), status="current")
+            .order_by("-verified_at", "-id")
+            .values("pk")[:1]
+        )
+        return self.update(current_location=models.Subquery(newest), updated_at=timezone.now())
+
+    def in_bbox(self, south, west, north, east):
+        """
+        Meowls whose current location is inside the box (west > east wraps
+        the antimeridian), via the geohash index.
+        """
+        # as a subquery so the planner starts from the geohash index, not from Meowl
+        inside = MeowlLocation.objects.filter(geo.bbox_q(south, west, north, east)).values("pk")
+        return self.filter(current_location__in=inside)
+
+    def nearest(self, lat, lng, k=10):
+        """
+        [(distance in metres, meowl), ...] for the k Meowls closest to (lat, lng).
+        """
+        return geo.nearest(self.with_location(), lat, lng, k, prefix="current_location__", box=MeowlQuerySet.in_bbox)
+
+    def refresh_scan_stats(self):
+        """
+        Recompute last_scanned_at/scan_count from Scan, in one UPDATE.
+        """
+        scans = Scan.objects.filter(meowl=models.OuterRef("pk")).order_by().values("meowl")
+        return self.update(
+            updated_at=timezone.now(),
+            last_scanned_at=models.Subquery(scans.annotate(last=models.Max("created_at")).values("last")),
+            scan_count=Coalesce(
+                models.Subquery(scans.annotate(n=models.Count("pk")).values("n")), 0
+            ),
+        )
 
 
 class Meowl(models.Model):
@@ -16,22 +68,35 @@ class Meowl(models.Model):
         User, null=True, blank=True, on_delete=models.SET_NULL, related_name="meowls_archived"
     )
 
+    # Denormalized newest "current" MeowlLocation; kept in sync by signals.py
+    current_location = models.ForeignKey(
+        "MeowlLocation", null=True, blank=True, editable=False, on_delete=models.SET_NULL, related_name="+"
+    )
+
+    # Denormalized from Scan by utils.record_scan (manage.py backfill_scan_stats rebuilds them)
+    last_scanned_at = models.DateTimeField(null=True, blank=True, editable=False)
+    scan_count = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
+    # bumped by save() and by the bulk updates above; the API's ETags/Last-Modified
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = MeowlQuerySet.as_manager()
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            # daily creation limit in meowl_create
+            models.Index(fields=["owner", "created_at"], name="meowl_owner_created"),
+            # staff dashboard keyset pages
+            models.Index(fields=["name", "id"], name="meowl_name_id"),
+            # meowl_index: active Meowls by name
+            models.Index(fields=["is_archived", "name"], name="meowl_archived_name"),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
-    @property
-    def current_location(self) -> "MeowlLocation | None":
-        return (
-            self.locations.filter(status="current")
-            .order_by("-verified_at", "-id")
-            .first()
-        )
-
     @property
     def lat(self):
         loc = self.current_location
@@ -62,14 +127,29 @@ class MeowlLocation(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="proposed")
     verified_at = models.DateTimeField(null=True, blank=True)
 
+    # grid cell for bbox/nearest lookups (geo.py); set from lat/lng on save
+    geohash = models.CharField(max_length=12, blank=True, default="", editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-verified_at", "-id"]
+        indexes = [
+            # newest "current" location per Meowl (refresh_current_location)
+            models.Index(fields=["meowl", "status", "-verified_at", "-id"], name="meowlloc_meowl_status_newest"),
+            models.Index(fields=["geohash"], name="meowlloc_geohash"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.meowl.slug} @ ({self.lat:.5f}, {self.lng:.5f}) [{self.status}]"
 
+    def save(self, *args, **kwargs):
+        self.geohash = geo.encode(self.lat, self.lng)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"lat", "lng"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
+
 
 class LocationVerification(models.Model):
     meowl = models.ForeignKey(Meowl, on_delete=models.CASCADE, null=True, blank=True)  # <-- nullable
@@ -84,10 +164,29 @@ class Scan(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     user_agent = models.TextField(blank=True, default="")
     ip_hash = models.CharField(max_length=64, blank=True, default="")
+    # Local day of the scan; unique per (meowl, user) so a double tap can't
+    # award twice. NULL only on duplicate scans recorded before the constraint.
+    day = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["meowl", "user", "created_at"], name="scan_meowl_user_created"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["meowl", "user", "day"], name="scan_once_per_day"),
+        ]
+
+
+class CommentQuerySet(models.QuerySet):
+    def visible(self):
+        """
+        Comments that aren't hidden. Spelled as an IN because is_hidden=False
+        compiles to NOT "is_hidden", which can't seek the (meowl, is_hidden,
+        -created_at) index; IN (false) is an equality that can.
+        """
+        return self.filter(is_hidden__in=[False])
 
 
 class Comment(models.Model):
@@ -102,8 +201,18 @@ class Comment(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # visible comments for a Meowl, newest first (meowl_detail)
+            models.Index(fields=["meowl", "is_hidden", "-created_at"], name="comment_meowl_hidden_newest"),
+            # staff see hidden ones too
+            models.Index(fields=["meowl", "-created_at"], name="comment_meowl_newest"),
+            # staff dashboard keyset pages
+            models.Index(fields=["-created_at", "-id"], name="comment_newest"),
+        ]
 
     def __str__(self) -> str:
         return f"#{self.id} by {self.user.username} on {self.meowl.slug}"
@@ -120,6 +229,35 @@ class PointsLedger(models.Model):
         ordering = ["-created_at"]
 
 
+class UserPoints(models.Model):
+    """
+    Running PointsLedger total per user, maintained by utils.award_points
+    (rebuild with `manage.py rebuild_points`).
+    """
+    user = models.OneToOneField(User, primary_key=True, on_delete=models.CASCADE, related_name="points_total")
+    total = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["-total"], name="userpoints_total_desc")]
+
+    def __str__(self) -> str:
+        return f"UserPoints<{self.user_id}> {self.total}"
+
+
+class DailyPoints(models.Model):
+    """
+    Points per user per day, for the 7d/30d leaderboards.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    day = models.DateField()
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "day"], name="dailypoints_user_day")]
+        indexes = [models.Index(fields=["day", "user"], name="dailypoints_day_user")]
+
+
 class AuditLog(models.Model):
     ACTION_CHOICES = (
         ("comment_hide", "Hide Comment"),
@@ -130,6 +268,7 @@ class AuditLog(models.Model):
         ("user_demote", "Demote User"),
         ("user_suspend", "Suspend User"),      # NEW
         ("user_unsuspend", "Unsuspend User"),  # NEW
+        ("poster_reissue", "Reissue Poster"),
         ("scan", "Scan"),
         ("create", "Create"),
         ("verify", "Verify"),
@@ -145,10 +284,12 @@ class AuditLog(models.Model):
     )  # <-- fixed: removed stray line
     comment_id = models.IntegerField(null=True, blank=True)
     detail = models.TextField(blank=True, default="")
-    created_at = models.DateTimeField(auto_now_add=True)
+    # not auto_now_add: rows are bulk-written by audit.py after the fact
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at"], name="auditlog_newest")]
 
     def __str__(self) -> str:
         who = self.actor.username if self.actor else "system"
@@ -171,3 +312,56 @@ class UserStatus(models.Model):
 
     def __str__(self):
         return f"UserStatus<{self.user_id}>"
+
+
+class PosterJob(models.Model):
+    """
+    Queued poster render, picked up by `manage.py poster_worker`.
+    """
+    STATUS_CHOICES = (
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    )
+
+    meowl = models.ForeignKey(Meowl, on_delete=models.CASCADE, related_name="poster_jobs")
+    requested_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    error = models.TextField(blank=True, default="")
+    # the Meowl's id while queued/running, NULL once finished: unique, so a
+    # Meowl can't have two renders in flight (NULLs never collide)
+    in_flight = models.PositiveBigIntegerField(null=True, blank=True, unique=True, editable=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self) -> str:
+        return f"PosterJob<{self.meowl_id}> [{self.status}]"
+
+
+class PosterSerial(models.Model):
+    """
+    One print run of a Meowl's poster. Its QR token (tokens.make_poster_token)
+    never expires; revoking (or deleting) the serial is what retires the
+    printed copies. Revoke rather than delete, to keep the history.
+    """
+    meowl = models.ForeignKey(Meowl, on_delete=models.CASCADE, related_name="poster_serials")
+    created_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+    revoked_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+
+    class Meta:
+        indexes = [
+            # the live serial per Meowl (utils.poster_serials)
+            models.Index(fields=["meowl", "revoked_at", "-id"], name="posterserial_live"),
+        ]
+
+    def __str__(self) -> str:
+        return f"PosterSerial<{self.pk}> {self.meowl_id}{' [revoked]' if self.revoked_at else ''}"
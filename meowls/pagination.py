@@ -0,0 +1,83 @@
+# meowls/pagination.py
+"""
+Keyset (cursor) pagination.
+
+OFFSET pagination makes the database walk and throw away every row before
+the page, so late pages get slower as tables grow. A keyset page instead
+asks for rows strictly after the last one shown, which an index on the
+ordering columns answers directly. The ordering must end in a unique
+column (normally the pk) so the cursor is unambiguous.
+"""
+import base64
+import json
+from dataclasses import dataclass
+
+from django.db.models import Q
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_cursor: str | None
+
+
+def _json_default(value):
+    # full isoformat; DjangoJSONEncoder would cut microseconds and break ties
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values, default=_json_default, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str, model, fields: list[str]) -> list | None:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(fields):
+            return None
+        return [model._meta.get_field(f).to_python(v) for f, v in zip(fields, values)]
+    except Exception:
+        # a mangled cursor just means "first page"
+        return None
+
+
+def _after(ordering: list[str], values: list) -> Q:
+    """
+    Rows after `values` in `ordering`:
+    (a > x) OR (a = x AND b > y) OR ...  with < for descending columns.
+    """
+    cond = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        op = "lt" if field.startswith("-") else "gt"
+        cond |= Q(**equal, **{f"{name}__{op}": value})
+        equal[name] = value
+    return cond
+
+
+def keyset_page(qs, ordering: list[str], cursor: str | None = None, limit: int = 50) -> KeysetPage:
+    """
+    One page of `qs` ordered by `ordering` (plain model fields, last one
+    unique), starting after `cursor`. Works on .values() querysets too, as
+    long as they select the ordering fields.
+    """
+    fields = [f.lstrip("-") for f in ordering]
+    qs = qs.order_by(*ordering)
+    values = _decode(cursor, qs.model, fields) if cursor else None
+    if values is not None:
+        qs = qs.filter(_after(ordering, values))
+    items = list(qs[:limit + 1])
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        if isinstance(last, dict):  # .values() querysets
+            next_cursor = _encode([last[f] for f in fields])
+        else:
+            next_cursor = _encode([getattr(last, f) for f in fields])
+    return KeysetPage(items, next_cursor)
@@ -1,23 +1,96 @@
+import base64
+import logging
+from functools import lru_cache
 from io import BytesIO
 from django.conf import settings
 from django.template.loader import render_to_string
 from weasyprint import HTML
 
-def build_meowl_pdf(meowl):
-    # short-lived token used in printed QR
-    from .tokens import make_qr_token
-    token = make_qr_token(meowl.slug)
-    qr_url = f"{settings.SITE_URL}/meowls/{meowl.slug}/?t={token}"
+from .assets import url_fetcher
+from .metrics import timed
+from .pdfstamp import PLACEHOLDER_PX, StampError, stamp_qr
 
-    # absolute URL for the header image (single official image)
-    header_image = settings.SITE_URL.rstrip("/") + settings.MEOWL_HEADER_IMAGE
+logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=1)
+def _qr_placeholder() -> str:
+    # plain white greyscale PNG; greyscale + no alpha keeps it a single XObject
+    from PIL import Image
+    bio = BytesIO()
+    Image.new("L", (PLACEHOLDER_PX, PLACEHOLDER_PX), 255).save(bio, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(bio.getvalue()).decode("ascii")
+
+
+def _header_image() -> str:
+    # absolute URL for the header image (single official image);
+    # assets.url_fetcher serves it from memory rather than over HTTP
+    return settings.SITE_URL.rstrip("/") + settings.MEOWL_HEADER_IMAGE
+
+
+def build_poster_base() -> bytes:
+    """
+    Render the poster page once with a blank QR placeholder.
+    Nothing on it depends on the Meowl, so one base serves every poster.
+    """
+    html = render_to_string("meowls/pdf.html", {
+        "qr_placeholder": _qr_placeholder(),
+        "header_image": _header_image(),
+        "site_url": settings.SITE_URL,
+    })
+    # uncompressed => classic xref table, which is what the stamper appends to
+    html = HTML(string=html, base_url=str(settings.BASE_DIR), url_fetcher=url_fetcher)
+    return html.write_pdf(uncompressed_pdf=True)
+
+
+def _meowl_html(meowl, qr_url: str) -> HTML:
     html = render_to_string("meowls/pdf.html", {
         "meowl": meowl,
         "qr_url": qr_url,
-        "header_image": header_image,
+        "qr_format": settings.QR_IMAGE_FORMAT,
+        "header_image": _header_image(),
         "site_url": settings.SITE_URL,
     })
+    return HTML(string=html, base_url=str(settings.BASE_DIR), url_fetcher=url_fetcher)
+
+
+def render_meowl_pdf(meowl, qr_url: str) -> bytes:
+    """
+    Full WeasyPrint render with the QR drawn in place (the slow path).
+    """
     out = BytesIO()
-    HTML(string=html, base_url=str(settings.BASE_DIR)).write_pdf(out)
+    _meowl_html(meowl, qr_url).write_pdf(out)
     return out.getvalue()
+
+
+def render_meowls_pdf(meowls_and_urls) -> bytes:
+    """
+    Slow-path multi-page poster: one full render per Meowl, pages joined.
+    """
+    docs = [_meowl_html(m, url).render() for m, url in meowls_and_urls]
+    pages = [page for doc in docs for page in doc.pages]
+    return docs[0].copy(pages).write_pdf()
+
+
+def poster_qr_url(meowl, serial: int | None = None) -> str:
+    # long-lived poster token; utils.reissue_poster revokes it
+    from .tokens import make_poster_token
+    from .utils import poster_serials
+
+    if serial is None:
+        serial = poster_serials([meowl])[meowl.pk]
+    token = make_poster_token(meowl.slug, serial, meowl.pk)
+    return f"{settings.SITE_URL}/meowls/{meowl.slug}/?t={token}"
+
+
+def build_meowl_pdf(meowl, serial: int | None = None):
+    from .poster_cache import get_poster_base
+
+    qr_url = poster_qr_url(meowl, serial)
+
+    with timed("meowl_pdf_build_seconds"):
+        try:
+            return stamp_qr(get_poster_base(build_poster_base), qr_url)
+        except StampError:
+            logger.exception("Couldn't stamp QR onto poster base; rendering %s in full", meowl.slug)
+            return render_meowl_pdf(meowl, qr_url)
@@ -0,0 +1,255 @@
+# meowls/pdfstamp.py
+"""
+Stamp a fresh QR code onto an already rendered poster page.
+
+The poster base is rendered once by WeasyPrint with a blank placeholder
+image (an odd size no real artwork has) where the QR goes. Stamping appends
+an incremental update that redefines that one image object with the QR
+modules, so the page layout, fonts and header image are reused byte for byte
+and a new token costs a QR encode plus a few hundred bytes of PDF.
+"""
+import re
+import zlib
+from typing import Iterable, Iterator
+
+import qrcode
+
+# Width/height in pixels of the blank image pdf.html is rendered with.
+PLACEHOLDER_PX = 977
+
+
+class StampError(Exception):
+    """The base PDF doesn't look like something we know how to stamp."""
+
+
+def _startxref(pdf: bytes) -> int:
+    pos = pdf.rfind(b"startxref")
+    if pos < 0:
+        raise StampError("no startxref")
+    return int(pdf[pos + len(b"startxref"):].split(None, 1)[0])
+
+
+def _parse_xref(pdf: bytes) -> tuple[dict[int, int], bytes, int]:
+    """
+    Return ({object number: offset}, trailer dict body, startxref) for a PDF
+    with a single classic xref table (what WeasyPrint writes uncompressed).
+    """
+    start = _startxref(pdf)
+    if not pdf.startswith(b"xref", start):
+        raise StampError("base PDF must use a classic xref table (render with uncompressed_pdf=True)")
+
+    offsets: dict[int, int] = {}
+    lines = iter(pdf[start:].split(b"\n")[1:])
+    for line in lines:
+        line = line.strip()
+        if line.startswith(b"trailer"):
+            break
+        first, count = (int(v) for v in line.split())
+        for num in range(first, first + count):
+            offset, _gen, kind = next(lines).split()[:3]
+            if kind == b"n":
+                offsets[num] = int(offset)
+
+    tpos = pdf.find(b"trailer", start)
+    m = re.search(rb"<<(.*)>>", pdf[tpos:pdf.find(b"startxref", tpos)], re.S)
+    if not m:
+        raise StampError("no trailer dictionary")
+    return offsets, m.group(1), start
+
+
+def find_placeholder(pdf: bytes, offsets: dict[int, int] | None = None) -> int:
+    """
+    Object number of the placeholder image XObject.
+    """
+    if offsets is None:
+        offsets = _parse_xref(pdf)[0]
+    width = f"/Width {PLACEHOLDER_PX}".encode()
+    height = f"/Height {PLACEHOLDER_PX}".encode()
+    found = []
+    for num, offset in offsets.items():
+        head = pdf[offset:offset + 1024].split(b"endobj", 1)[0]
+        end = head.find(b"stream")
+        if end < 0:
+            continue
+        head = head[:end]
+        if b"/Subtype /Image" in head and re.search(rb"%s\b" % width, head) and re.search(rb"%s\b" % height, head):
+            found.append(num)
+    if len(found) != 1:
+        raise StampError(f"expected one QR placeholder, found {len(found)}")
+    return found[0]
+
+
+def qr_image_object(data: str) -> bytes:
+    """
+    A 1-bit DeviceGray image XObject (one pixel per module, border included).
+    Built straight from the QR matrix, no PIL involved.
+    """
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    size = len(matrix)
+    pad = "1" * (-size % 8)
+    rows = bytearray()
+    for row in matrix:
+        bits = "".join("0" if dark else "1" for dark in row) + pad
+        rows += int(bits, 2).to_bytes(len(bits) // 8, "big")
+    stream = zlib.compress(bytes(rows))
+    head = (
+        f"<< /Type /XObject /Subtype /Image /Width {size} /Height {size} "
+        f"/ColorSpace /DeviceGray /BitsPerComponent 1 /Interpolate false "
+        f"/Filter /FlateDecode /Length {len(stream)} >>"
+    ).encode()
+    return head + b"\nstream\n" + stream + b"\nendstream"
+
+
+def _object_body(pdf: bytes, offset: int) -> bytes:
+    """
+    The `<< ... >>` part of a non-stream object.
+    """
+    start = pdf.index(b"obj", offset) + 3
+    return pdf[start:pdf.index(b"endobj", start)].strip()
+
+
+def _find_page(pdf: bytes, offsets: dict[int, int]) -> tuple[int, bytes]:
+    pages = []
+    for num, offset in offsets.items():
+        head = pdf[offset:offset + 1024].split(b"endobj", 1)[0]
+        if b"stream" not in head and re.search(rb"/Type\s*/Page\b", head):
+            pages.append((num, _object_body(pdf, offset)))
+    if len(pages) != 1:
+        raise StampError(f"expected a one-page base, found {len(pages)} pages")
+    return pages[0]
+
+
+def _ref(num: int) -> bytes:
+    return f"{num} 0 R".encode()
+
+
+def _sub_ref(body: bytes, old: int, new: int) -> bytes:
+    return re.sub(rb"\b%d 0 R" % old, _ref(new), body)
+
+
+class _Update:
+    """
+    Writes an incremental update after `base`, tracking object offsets.
+    """
+
+    def __init__(self, base: bytes):
+        self.offsets, trailer, self.prev = _parse_xref(base)
+        self.trailer = re.sub(rb"/Prev\s+\d+", b"", trailer).strip()
+        self.size = int(re.search(rb"/Size\s+(\d+)", self.trailer).group(1))
+        self.position = len(base)
+        self.lead = b"" if base.endswith(b"\n") else b"\n"
+        self.position += len(self.lead)
+        self.written: dict[int, int] = {}
+
+    def start(self) -> bytes:
+        return self.lead
+
+    def obj(self, num: int, body: bytes) -> bytes:
+        data = f"{num} 0 obj\n".encode() + body + b"\nendobj\n"
+        self.written[num] = self.position
+        self.position += len(data)
+        return data
+
+    def finish(self) -> bytes:
+        size = max(self.size, max(self.written) + 1)
+        trailer = re.sub(rb"/Size\s+\d+", f"/Size {size}".encode(), self.trailer)
+        out = [b"xref\n"]
+        nums = sorted(self.written)
+        i = 0
+        while i < len(nums):
+            j = i
+            while j + 1 < len(nums) and nums[j + 1] == nums[j] + 1:
+                j += 1
+            out.append(f"{nums[i]} {j - i + 1}\n".encode())
+            out.extend(f"{self.written[n]:010} 00000 n \n".encode() for n in nums[i:j + 1])
+            i = j + 1
+        out.append(b"trailer\n<< " + trailer + f" /Prev {self.prev} >>\n".encode())
+        out.append(f"startxref\n{self.position}\n%%EOF\n".encode())
+        return b"".join(out)
+
+
+def stamp_object(base: bytes, image_object: bytes) -> bytes:
+    """
+    Return `base` with the placeholder image replaced by `image_object`
+    (as built by qr_image_object).
+    """
+    update = _Update(base)
+    num = find_placeholder(base, update.offsets)
+    return base + update.start() + update.obj(num, image_object) + update.finish()
+
+
+def stamp_qr(base: bytes, data: str) -> bytes:
+    """
+    Return `base` with the placeholder image replaced by a QR code for `data`.
+    """
+    return stamp_object(base, qr_image_object(data))
+
+
+def iter_stamp_pages(base: bytes, image_objects: Iterable[bytes], count: int) -> Iterator[bytes]:
+    """
+    Stream a `count`-page PDF: the base page repeated, each copy showing the
+    next of `image_objects`. Extra pages share the base's content stream and
+    header image; each only adds its QR image, a resources dict and a page.
+    """
+    if count < 1:
+        raise StampError("nothing to stamp")
+    update = _Update(base)
+    placeholder = find_placeholder(base, update.offsets)
+    page_num, page = _find_page(base, update.offsets)
+
+    parent = re.search(rb"/Parent\s+(\d+) 0 R", page)
+    if not parent:
+        raise StampError("page has no /Parent")
+    pages_num = int(parent.group(1))
+    pages = _object_body(base, update.offsets[pages_num])
+
+    # the placeholder is referenced from either an inline or an indirect resources dict
+    resources_num = None
+    if _ref(placeholder) not in page:
+        res = re.search(rb"/Resources\s+(\d+) 0 R", page)
+        if not res:
+            raise StampError("can't find the placeholder's resources")
+        resources_num = int(res.group(1))
+        resources = _object_body(base, update.offsets[resources_num])
+        if _ref(placeholder) not in resources:
+            raise StampError("placeholder isn't in the page resources")
+
+    # object numbers for page i >= 1: image, (resources), page
+    per_page = 3 if resources_num is not None else 2
+    first_new = update.size
+
+    def numbers(i):
+        n = first_new + per_page * (i - 1)
+        return n, n + 1, n + per_page - 1
+
+    kids = [page_num] + [numbers(i)[2] for i in range(1, count)]
+    pages = re.sub(rb"/Kids\s*\[[^\]]*\]", b"/Kids [" + b" ".join(_ref(k) for k in kids) + b"]", pages)
+    pages = re.sub(rb"/Count\s+\d+", f"/Count {count}".encode(), pages)
+
+    yield base
+    yield update.start()
+    yield update.obj(pages_num, pages)
+
+    stamped = 0
+    for i, image_object in enumerate(image_objects):
+        if i >= count:
+            break
+        if i == 0:
+            yield update.obj(placeholder, image_object)
+        else:
+            img_num, res_num, new_page_num = numbers(i)
+            yield update.obj(img_num, image_object)
+            if resources_num is not None:
+                yield update.obj(res_num, _sub_ref(resources, placeholder, img_num))
+                new_page = _sub_ref(page, resources_num, res_num)
+            else:
+                new_page = _sub_ref(page, placeholder, img_num)
+            yield update.obj(new_page_num, new_page)
+        stamped += 1
+    if stamped != count:
+        raise StampError(f"expected {count} images, got {stamped}")
+
+    yield update.finish()
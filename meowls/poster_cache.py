@@ -0,0 +1,203 @@
+# meowls/poster_cache.py
+"""
+On-disk cache for rendered poster PDFs.
+
+Entries live under MEDIA_ROOT/posters and are keyed by slug, the live
+poster serial its QR carries, the poster template version and a hash of
+the header image. Editing either the template or the official image
+invalidates every poster at once; revoking a serial (however it's done)
+makes its poster unreachable, even one a worker finishes rendering later.
+A file's mtime is when it was rendered (freshness + Last-Modified),
+its atime is when it was last served (LRU eviction).
+"""
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, NamedTuple
+
+from django.conf import settings
+
+from .assets import static_digest, static_relpath
+
+# Bump whenever templates/meowls/pdf.html (or what build_meowl_pdf feeds it) changes.
+POSTER_TEMPLATE_VERSION = 3
+
+_base_pages: dict[str, bytes] = {}  # base key -> rendered base page
+
+HTTP_MAX_AGE = 300  # browsers revalidate at least this often, so a reissued poster shows up
+
+
+class CachedPoster(NamedTuple):
+    file: BinaryIO
+    etag: str
+    last_modified: float
+    max_age: int
+
+
+def cache_dir() -> Path:
+    return Path(settings.MEDIA_ROOT) / "posters"
+
+
+def header_image_hash() -> str:
+    rel = static_relpath(settings.MEOWL_HEADER_IMAGE)
+    if rel is None:
+        return "none"
+    # hash what actually goes into the PDF (possibly the downscaled variant)
+    return static_digest(rel, settings.POSTER_IMAGE_MAX_PX)
+
+
+def _slug_digest(slug: str) -> str:
+    return hashlib.sha1(slug.encode()).hexdigest()[:12]
+
+
+def _live_serial(meowl) -> int:
+    from .utils import poster_serials
+
+    return poster_serials([meowl])[meowl.pk]
+
+
+def poster_key(slug: str, serial: int) -> str:
+    raw = f"{slug}:{serial}:{POSTER_TEMPLATE_VERSION}:{header_image_hash()}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def base_key() -> str:
+    raw = f"{POSTER_TEMPLATE_VERSION}:{header_image_hash()}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def poster_path(slug: str, serial: int) -> Path:
+    return cache_dir() / f"{_slug_digest(slug)}-{poster_key(slug, serial)}.pdf"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def evict(max_bytes: int | None = None, keep: Path | None = None) -> int:
+    """
+    Drop least recently served posters until the cache fits in max_bytes.
+    Returns the number of files removed.
+    """
+    if max_bytes is None:
+        max_bytes = settings.POSTER_CACHE_MAX_BYTES
+    entries = []
+    total = 0
+    for p in cache_dir().glob("*.pdf"):
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_atime, st.st_size, p))
+        total += st.st_size
+
+    removed = 0
+    for _atime, size, p in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if p == keep:
+            continue
+        try:
+            p.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def invalidate(slug: str) -> None:
+    for p in cache_dir().glob(f"{_slug_digest(slug)}-*.pdf"):
+        try:
+            p.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def has_fresh_poster(meowl) -> bool:
+    try:
+        mtime = poster_path(meowl.slug, _live_serial(meowl)).stat().st_mtime
+    except FileNotFoundError:
+        return False
+    return time.time() - mtime < settings.POSTER_CACHE_SECONDS
+
+
+def get_poster_base(build: Callable) -> bytes:
+    """
+    The QR-less poster page, rendered by `build()` at most once per template
+    version/header image and shared between processes via MEDIA_ROOT.
+    Lives in a subdirectory so poster eviction never touches it.
+    """
+    key = base_key()
+    data = _base_pages.get(key)
+    if data is not None:
+        return data
+
+    path = cache_dir() / "base" / f"{key}.pdf"
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        data = build()
+        _write_atomic(path, data)
+        for old in path.parent.glob("*.pdf"):
+            if old != path:
+                old.unlink(missing_ok=True)
+
+    _base_pages.clear()
+    _base_pages[key] = data
+    return data
+
+
+def get_poster(meowl, build: Callable) -> CachedPoster:
+    """
+    Return an open handle on the cached poster for `meowl`, rendering it with
+    `build(meowl, serial)` first if there's no fresh copy on disk.
+    The caller owns (and must close) the returned file.
+    """
+    serial = _live_serial(meowl)
+    path = poster_path(meowl.slug, serial)
+    ttl = settings.POSTER_CACHE_SECONDS
+    now = time.time()
+
+    try:
+        fh = open(path, "rb")
+        mtime = os.fstat(fh.fileno()).st_mtime
+        if now - mtime >= ttl:
+            fh.close()
+            fh = None
+    except FileNotFoundError:
+        fh = None
+
+    if fh is None:
+        # stale or missing: drop other variants of this slug, then render
+        invalidate(meowl.slug)
+        _write_atomic(path, build(meowl, serial))
+        evict(keep=path)
+        fh = open(path, "rb")
+        mtime = os.fstat(fh.fileno()).st_mtime
+    else:
+        # record the hit for LRU without touching the render time
+        try:
+            os.utime(path, (now, mtime))
+        except FileNotFoundError:
+            pass
+
+    return CachedPoster(
+        file=fh,
+        etag=f'"{path.stem}-{int(mtime)}"',
+        last_modified=mtime,
+        max_age=max(0, min(int(ttl - (now - mtime)), HTTP_MAX_AGE)),
+    )
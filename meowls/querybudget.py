@@ -0,0 +1,318 @@
+# meowls/querybudget.py
+"""
+Per-view SQL query budgets (manage.py query_budget).
+
+Each case requests one endpoint on a freshly seeded dataset (bench.seed)
+with the cache emptied first, so every page and fragment is built from
+the database, and counts its SQL. The dataset is seeded at two sizes: one
+smaller than a page everywhere, one that fills every page. A view passes
+when it stays within BUDGETS at both sizes *and* issues the same number
+of queries at both; a count that moves with the data is an N+1 whatever
+the budget says.
+
+Failures list the statements that ran more than once, with where they
+were issued from: the innermost app frame and, for queries fired while
+rendering, the template line.
+"""
+import sys
+from collections import Counter
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from . import audit, scanstats
+from .models import Meowl
+from .pagination import keyset_page
+from .tokens import make_qr_token
+from .views import COMMENT_ORDER, COMMENT_PAGE_SIZE
+
+# case -> most queries it may issue (cold cache, session + user lookups included)
+BUDGETS = {
+    "index": 1,
+    "index_user": 3,
+    "detail": 6,
+    "detail_staff": 7,
+    "comments": 4,
+    "comments_json": 4,
+    "scan": 4,
+    "staff_dashboard": 6,
+    "staff_dashboard_filtered": 6,
+    "metrics": 2,
+    "pdf_preview": 5,
+    "pdf_status": 5,
+    "pdf_file": 4,
+    "pdf_download": 4,
+    "leaderboard": 1,
+    "leaderboard_7d": 3,
+    "signup": 0,
+    "resend_verification": 2,
+    "verify_email": 2,
+    "api_meowls": 4,
+    "api_meowl": 3,
+    "api_comments": 5,
+    "api_leaderboard": 1,
+    "api_near_bbox": 3,
+    "api_near_k": 11,
+    "api_tile": 3,
+}
+
+# cases whose count legitimately depends on the data; only the budget applies
+# (api_near_k widens its search box until k Meowls are in range: at most ~9 rounds)
+DATA_DEPENDENT = {"api_near_k"}
+
+CASES = []
+
+
+def case(name, role=None):
+    """
+    Register `url(ctx)` as case `name`, requested by `role`
+    (None: anonymous, "user": a plain verified user, "staff").
+    """
+    def register(url):
+        CASES.append((name, role, url))
+        return url
+    return register
+
+
+@case("index")
+def _(ctx):
+    return reverse("meowls:index")
+
+
+@case("index_user", "user")
+def _(ctx):
+    return reverse("meowls:index")
+
+
+@case("detail", "user")
+def _(ctx):
+    return f"{reverse('meowls:detail', args=[ctx['slug']])}?t={ctx['token']}"
+
+
+@case("detail_staff", "staff")
+def _(ctx):
+    return reverse("meowls:detail", args=[ctx["slug"]])
+
+
+@case("comments", "user")
+def _(ctx):
+    return f"{reverse('meowls:comments', args=[ctx['slug']])}?t={ctx['token']}&after={ctx['cursor']}"
+
+
+@case("comments_json", "staff")
+def _(ctx):
+    return f"{reverse('meowls:comments', args=[ctx['slug']])}?format=json"
+
+
+@case("scan", "user")
+def _(ctx):
+    return reverse("meowls:scan", args=[ctx["slug"]])
+
+
+@case("staff_dashboard", "staff")
+def _(ctx):
+    return reverse("meowls:staff_dashboard")
+
+
+@case("staff_dashboard_filtered", "staff")
+def _(ctx):
+    return reverse("meowls:staff_dashboard") + "?m_state=active&c_state=hidden&l_action=scan&u_role=staff"
+
+
+@case("metrics", "staff")
+def _(ctx):
+    return reverse("meowls:metrics")
+
+
+@case("pdf_preview", "staff")
+def _(ctx):
+    return reverse("meowls:pdf_preview", args=[ctx["slug"]])
+
+
+@case("pdf_status", "staff")
+def _(ctx):
+    return reverse("meowls:pdf_status", args=[ctx["slug"]])
+
+
+@case("pdf_file", "staff")
+def _(ctx):
+    return reverse("meowls:pdf_file", args=[ctx["slug"]])
+
+
+@case("pdf_download", "staff")
+def _(ctx):
+    return reverse("meowls:pdf_download", args=[ctx["slug"]])
+
+
+@case("leaderboard")
+def _(ctx):
+    return reverse("meowls:leaderboard")
+
+
+@case("leaderboard_7d", "user")
+def _(ctx):
+    return reverse("meowls:leaderboard_period", args=["7d"])
+
+
+@case("signup")
+def _(ctx):
+    return reverse("meowls:signup")
+
+
+@case("resend_verification", "user")
+def _(ctx):
+    return reverse("meowls:resend_verification")
+
+
+@case("verify_email")
+def _(ctx):
+    return reverse("meowls:verify_email", args=[ctx["uid"], ctx["email_token"]])
+
+
+@case("api_meowls", "staff")
+def _(ctx):
+    return reverse("meowls:api_meowls")
+
+
+@case("api_meowl", "staff")
+def _(ctx):
+    return reverse("meowls:api_meowl", args=[ctx["slug"]])
+
+
+@case("api_comments", "staff")
+def _(ctx):
+    return reverse("meowls:api_comments", args=[ctx["slug"]])
+
+
+@case("api_leaderboard")
+def _(ctx):
+    return reverse("meowls:api_leaderboard")
+
+
+@case("api_near_bbox", "staff")
+def _(ctx):
+    return reverse("meowls:api_meowls_near") + "?bbox=29.9,-98.1,30.6,-97.4"
+
+
+@case("api_near_k", "staff")
+def _(ctx):
+    return reverse("meowls:api_meowls_near") + "?lat=30.27&lng=-97.74&k=10"
+
+
+@case("api_tile", "staff")
+def _(ctx):
+    return reverse("meowls:api_tile", args=[9, 117, 211])
+
+
+# --- capturing ---
+
+def _origin() -> str:
+    """
+    Where the current query comes from: the innermost frame of this
+    project's code within the request (or, for middleware and the like,
+    the first caller outside the ORM), plus the innermost template node
+    being rendered.
+    """
+    app, caller, template = None, None, None
+    frame = sys._getframe(2)
+    while frame is not None and app is None:
+        filename = frame.f_code.co_filename
+        if filename.endswith("django/test/client.py"):
+            break  # out of the request
+        if template is None and filename.endswith(("django/template/base.py", "django/template/defaulttags.py")):
+            node = frame.f_locals.get("self")
+            if getattr(node, "origin", None) is not None and getattr(node, "token", None) is not None:
+                template = f"{node.origin.template_name}:{node.token.lineno}"
+        elif "site-packages" not in filename and filename.startswith(str(settings.BASE_DIR)):
+            app = _where(frame)
+        elif caller is None and "/django/db/" not in filename:
+            caller = _where(frame)
+        frame = frame.f_back
+    return " <- ".join(filter(None, (template, app or caller))) or "?"
+
+
+def _where(frame) -> str:
+    filename = frame.f_code.co_filename
+    for root in (str(settings.BASE_DIR), "site-packages"):
+        if root in filename:
+            filename = filename.split(root, 1)[1].lstrip("/")
+            break
+    return f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+@dataclass
+class Capture:
+    queries: list = field(default_factory=list)  # (sql, origin)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, _origin()))
+        return execute(sql, params, many, context)
+
+    def duplicates(self) -> list[tuple[int, str, Counter]]:
+        """
+        (times run, sql, origins) for statements issued more than once.
+        """
+        by_sql = {}
+        for sql, origin in self.queries:
+            by_sql.setdefault(sql, Counter())[origin] += 1
+        return sorted(
+            ((sum(origins.values()), sql, origins) for sql, origins in by_sql.items() if sum(origins.values()) > 1),
+            key=lambda d: -d[0],
+        )
+
+
+def context(prefix: str = "bench") -> dict:
+    """
+    URL arguments for the cases: the busy first Meowl of the dataset,
+    a cursor to its second comment page, and an email link.
+    """
+    meowl = Meowl.objects.filter(slug__startswith=f"{prefix}-").order_by("id").first()
+    first_page = keyset_page(meowl.comments.visible(), COMMENT_ORDER, None, COMMENT_PAGE_SIZE)
+    user = User.objects.get(username=f"{prefix}-user-1")  # not logged in below, so the link stays valid
+    return {
+        "slug": meowl.slug,
+        "token": make_qr_token(meowl.slug),
+        "cursor": first_page.next_cursor or "",
+        "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+        "email_token": default_token_generator.make_token(user),
+    }
+
+
+def measure(cases=None, prefix: str = "bench") -> dict:
+    """
+    Run the cases on the current database: name -> (status, Capture).
+    Each is requested twice and the second, cold-cache request counted,
+    so one-off side effects (the day's scan, a poster render) are settled.
+    Call with a throwaway cache, since this empties it.
+    """
+    ctx = context(prefix)
+    clients = {None: Client(), "user": Client(), "staff": Client()}
+    clients["user"].force_login(User.objects.get(username=f"{prefix}-user-0"))
+    clients["staff"].force_login(User.objects.get(username=f"{prefix}-staff"))
+
+    results = {}
+    for name, role, url in CASES:
+        if cases and name not in cases:
+            continue
+        client, target = clients[role], url(ctx)
+        for counted in (False, True):
+            cache.clear()
+            capture = Capture()
+            with connection.execute_wrapper(capture) if counted else nullcontext():
+                response = client.get(target)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            audit.flush()
+            scanstats.flush()
+        results[name] = (response.status_code, capture)
+    return results
+
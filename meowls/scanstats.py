@@ -0,0 +1,97 @@
+# meowls/scanstats.py
+"""
+Deferred Meowl.scan_count / last_scanned_at.
+
+Updating the Meowl row inside every scan's transaction made everyone
+scanning the same poster queue on that one row, and every scan retired
+the cached index page. Instead a committed (or deleted) scan marks its
+Meowl dirty, and dirty Meowls are recomputed from the Scan table
+(refresh_scan_stats, so the numbers are exact however many scans were
+folded in) at most every SCAN_STATS_FLUSH_SECONDS, then the index cache
+is bumped once. Whatever is dirty at exit is written then; if a process
+dies first, the next scan of that Meowl (or backfill_scan_stats) catches
+up. SCAN_STATS_FLUSH_SECONDS=0 writes after every scan.
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .caching import bump
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_dirty: set[int] = set()
+_timer: threading.Timer | None = None
+
+
+def touch(meowl_id: int) -> None:
+    """
+    Note that `meowl_id`'s scans changed, once the surrounding transaction
+    (if any) commits.
+    """
+    transaction.on_commit(lambda: _mark(meowl_id))
+
+
+def _mark(meowl_id: int) -> None:
+    if settings.SCAN_STATS_FLUSH_SECONDS <= 0:
+        _write({meowl_id})
+        return
+    with _lock:
+        _dirty.add(meowl_id)
+        _arm()
+
+
+def _arm() -> None:
+    # call with _lock held
+    global _timer
+    if _timer is None:
+        _timer = threading.Timer(settings.SCAN_STATS_FLUSH_SECONDS, _flush_in_thread)
+        _timer.daemon = True
+        _timer.start()
+
+
+def _flush_in_thread() -> None:
+    try:
+        flush()
+    finally:
+        connections.close_all()
+
+
+def flush() -> int:
+    """
+    Recompute every dirty Meowl now; returns how many were updated.
+    """
+    global _timer
+    with _lock:
+        ids = set(_dirty)
+        _dirty.clear()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    if not ids:
+        return 0
+    try:
+        return _write(ids)
+    except Exception:
+        # the set is bounded by the number of Meowls, so keeping them is safe
+        logger.exception("Couldn't refresh scan stats for %d Meowls; retrying later", len(ids))
+        with _lock:
+            _dirty.update(ids)
+            _arm()
+        return 0
+
+
+def _write(ids) -> int:
+    from .models import Meowl
+
+    updated = Meowl.objects.filter(pk__in=ids).refresh_scan_stats()
+    if updated:
+        bump("meowls")  # index cards show the last scan time
+    return updated
+
+
+atexit.register(flush)
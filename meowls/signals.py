@@ -0,0 +1,70 @@
+# meowls/signals.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import scanstats
+from .caching import bump
+from .models import Comment, Meowl, MeowlLocation, PointsLedger, PosterSerial, Scan, UserStatus
+from .utils import invalidate_leaderboard
+
+
+@receiver(post_save, sender=MeowlLocation)
+@receiver(post_delete, sender=MeowlLocation)
+def sync_current_location(sender, instance, **kwargs):
+    # a row entering or leaving "current" can change which one is newest
+    Meowl.objects.filter(pk=instance.meowl_id).refresh_current_location()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_status(sender, instance, created, **kwargs):
+    # every user has a status row, so nothing on the read path has to backfill
+    if created:
+        UserStatus.objects.get_or_create(user=instance)
+
+
+# --- cache invalidation (see caching.py); after commit so a reader can't re-cache old rows ---
+
+@receiver(post_save, sender=Meowl)
+@receiver(post_delete, sender=Meowl)
+def invalidate_index(sender, instance, **kwargs):
+    # index cards show name/description (the last scan time: see sync_scan_stats)
+    transaction.on_commit(lambda: bump("meowls"))
+
+
+@receiver(post_save, sender=Scan)
+@receiver(post_delete, sender=Scan)
+def sync_scan_stats(sender, instance, **kwargs):
+    # recomputed at most once a minute, which bumps "meowls" then
+    scanstats.touch(instance.meowl_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comments(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump(f"comments:{instance.meowl_id}"))
+
+
+@receiver(post_save, sender=PointsLedger)
+@receiver(post_delete, sender=PointsLedger)
+@receiver(post_save, sender=UserStatus)
+@receiver(post_delete, sender=UserStatus)
+def invalidate_points(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_leaderboard)
+
+
+@receiver(post_save, sender=MeowlLocation)
+@receiver(post_delete, sender=MeowlLocation)
+@receiver(post_save, sender=Meowl)
+@receiver(post_delete, sender=Meowl)
+def invalidate_map(sender, instance, **kwargs):
+    # map tiles (api.map_tile): a move, rename or (un)archive can touch any zoom level
+    transaction.on_commit(lambda: bump("map"))
+
+
+@receiver(post_save, sender=PosterSerial)
+@receiver(post_delete, sender=PosterSerial)
+def invalidate_live_serials(sender, instance, **kwargs):
+    # processes reload their live-serial map (tokens.live_serials)
+    transaction.on_commit(lambda: bump("poster_serials"))
@@ -1,16 +1,69 @@
 import base64
+from functools import lru_cache
 from io import BytesIO
 import qrcode
+from qrcode.constants import ERROR_CORRECT_M
 from django import template
 
 register = template.Library()
 
-@register.filter(name="qr_b64")
-def qr_b64(_val, data: str) -> str:
-    img = qrcode.make(data)
+MIME_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+def _svg(matrix) -> bytes:
+    # one path of horizontal runs in module units; the viewBox does the scaling
+    size = len(matrix)
+    d = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if row[x]:
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                d.append(f"M{start} {y}h{x - start}v1h-{x - start}z")
+            else:
+                x += 1
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="{size}" height="{size}" fill="#fff"/><path d="{"".join(d)}"/></svg>'
+    ).encode()
+
+
+@lru_cache(maxsize=512)
+def qr_image(data: str, error_correction: int = ERROR_CORRECT_M, box_size: int = 10, fmt: str = "png") -> bytes:
+    """
+    Encoded QR image for `data`, memoized on every input that changes the output.
+    "svg" is a single vector path and never touches PIL.
+    """
+    qr = qrcode.QRCode(error_correction=error_correction, box_size=box_size)
+    qr.add_data(data)
+    qr.make(fit=True)
+    if fmt == "svg":
+        return _svg(qr.get_matrix())
+    img = qr.make_image()
     bio = BytesIO()
     img.save(bio, format="PNG")
-    return base64.b64encode(bio.getvalue()).decode("ascii")
+    return bio.getvalue()
+
+
+@lru_cache(maxsize=512)
+def _qr_b64(data: str, fmt: str) -> str:
+    return base64.b64encode(qr_image(data, fmt=fmt)).decode("ascii")
+
+
+@register.filter(name="qr_b64")
+def qr_b64(_val, data: str) -> str:
+    return _qr_b64(data, "png")
+
+
+@register.filter(name="qr_data_uri")
+def qr_data_uri(fmt, data: str) -> str:
+    """
+    {{ "svg"|qr_data_uri:url }} -> data:image/svg+xml;base64,...  (falls back to PNG)
+    """
+    fmt = fmt if fmt in MIME_TYPES else "png"
+    return f"data:{MIME_TYPES[fmt]};base64,{_qr_b64(data, fmt)}"
 
 @register.filter
 def get_item(d, key):
@@ -0,0 +1,114 @@
+# meowls/tests/test_indexes.py
+"""
+Query plans for the hot-path indexes.
+
+Each query is captured from the code that issues it and run through
+SQLite's EXPLAIN QUERY PLAN, which has to search (or walk) the index the
+query was rewritten for. MariaDB's EXPLAIN is shaped differently, so these
+only run on SQLite.
+"""
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from meowls.models import AuditLog, Comment, Meowl, MeowlLocation, UserStatus
+from meowls.tokens import make_qr_token
+from meowls.utils import record_scan
+
+
+def explain(sql: str) -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def index_on(table: str, columns: list[str]) -> str:
+    """
+    Name of the index on `table` over exactly `columns` (in order), so
+    indexes SQLite names itself (unique constraints) can be asserted too.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA index_list("{table}")')
+        names = [row[1] for row in cursor.fetchall()]
+        for name in names:
+            cursor.execute(f'PRAGMA index_info("{name}")')
+            if [row[2] for row in cursor.fetchall()] == columns:
+                return name
+    raise AssertionError(f"no index on {table}({', '.join(columns)})")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite's")
+@override_settings(AUDIT_SYNC=True)
+class IndexPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("staff", password="x", is_staff=True)
+        cls.user = User.objects.create_user("user", password="x")
+        UserStatus.objects.filter(user__in=[cls.staff, cls.user]).update(email_verified=True)
+        cls.meowl = Meowl.objects.create(name="Plan", slug="plan", owner=cls.staff)
+        MeowlLocation.objects.create(meowl=cls.meowl, lat=30.27, lng=-97.74, status="current", verified_at=timezone.now())
+        Comment.objects.bulk_create([
+            Comment(meowl=cls.meowl, user=cls.user, text=f"c{i}", is_hidden=not i % 4) for i in range(30)
+        ])
+        AuditLog.objects.bulk_create([AuditLog(actor=cls.staff, action="verify") for _ in range(30)])
+
+    def setUp(self):
+        cache.clear()
+
+    def statements(self, table: str, run, verb: str = "SELECT") -> list[str]:
+        """
+        The `verb` statements touching `table` that `run()` issues.
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            run()
+        found = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith(verb) and f'"{table}"' in q["sql"]]
+        self.assertTrue(found, f"no {verb} on {table} was issued")
+        return found
+
+    def assertUsesIndex(self, sql: str, index: str) -> None:
+        plan = explain(sql)
+        self.assertTrue(
+            any(f" INDEX {index}" in step for step in plan),
+            f"expected {index} in plan:\n  " + "\n  ".join(plan) + f"\nfor: {sql}",
+        )
+
+    def test_scan_dedupe(self):
+        record_scan(self.meowl, self.user)
+        (sql,) = self.statements("meowls_scan", lambda: record_scan(self.meowl, self.user))
+        self.assertUsesIndex(sql, index_on("meowls_scan", ["meowl_id", "user_id", "day"]))
+
+    def test_daily_create_limit(self):
+        self.client.force_login(self.user)
+        sqls = self.statements("meowls_meowl", lambda: self.client.get(reverse("meowls:create")))
+        (sql,) = [s for s in sqls if "COUNT(" in s]
+        self.assertUsesIndex(sql, "meowl_owner_created")
+
+    def test_current_location(self):
+        run = lambda: Meowl.objects.filter(pk=self.meowl.pk).refresh_current_location()  # noqa: E731
+        (sql,) = self.statements("meowls_meowl", run, verb="UPDATE")
+        self.assertUsesIndex(sql, "meowlloc_meowl_status_newest")
+
+    def test_visible_comments(self):
+        url = f"{reverse('meowls:comments', args=[self.meowl.slug])}?t={make_qr_token(self.meowl.slug)}"
+        (sql,) = self.statements("meowls_comment", lambda: self.client.get(url))
+        self.assertIn('"is_hidden"', sql)
+        self.assertUsesIndex(sql, "comment_meowl_hidden_newest")
+
+    def test_staff_comments(self):
+        self.client.force_login(self.staff)
+        url = reverse("meowls:comments", args=[self.meowl.slug])
+        (sql,) = self.statements("meowls_comment", lambda: self.client.get(url))
+        self.assertNotIn('"is_hidden" =', sql)
+        self.assertUsesIndex(sql, "comment_meowl_newest")
+
+    def test_audit_ordering(self):
+        self.client.force_login(self.staff)
+        sqls = self.statements("meowls_auditlog", lambda: self.client.get(reverse("meowls:staff_dashboard")))
+        (sql,) = [s for s in sqls if "ORDER BY" in s]
+        self.assertUsesIndex(sql, "auditlog_newest")
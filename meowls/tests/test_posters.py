@@ -0,0 +1,53 @@
+# meowls/tests/test_posters.py
+"""
+Conditional GETs on the cached poster (pdf_file).
+
+The poster is put in the cache directory by hand, so nothing is rendered.
+"""
+import os
+import tempfile
+import time
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from meowls.models import Meowl
+from meowls.poster_cache import poster_path
+from meowls.utils import poster_serials
+
+
+@override_settings(AUDIT_SYNC=True)
+class PosterConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("staff", password="x", is_staff=True)
+        cls.meowl = Meowl.objects.create(name="Poster", slug="poster", owner=cls.staff)
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+
+        path = poster_path(self.meowl.slug, poster_serials([self.meowl])[self.meowl.pk])
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"%PDF-1.4 cached\n")
+        self.mtime = time.time() - 60.75  # fractional, like a real file's
+        os.utime(path, (self.mtime, self.mtime))
+
+        self.client.force_login(self.staff)
+        self.url = reverse("meowls:pdf_file", args=[self.meowl.slug])
+
+    def test_if_modified_since_alone_gets_304(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["Last-Modified"], http_date(int(self.mtime)))
+
+        again = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_older_if_modified_since_gets_the_file(self):
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(int(self.mtime) - 1))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF-1.4 cached\n")
@@ -0,0 +1,37 @@
+# meowls/tests/test_query_budget.py
+"""
+The query budgets (manage.py query_budget) at the small seed size.
+
+The command also compares counts against a full-size run to catch N+1s;
+that takes too long for the test suite, so this only checks every case
+answers and stays within its budget.
+"""
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from meowls import bench, querybudget
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    AUDIT_SYNC=False,
+    PROFILING=False,
+)
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        bench.seed(0.01)
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+
+    def test_every_case_within_budget(self):
+        for name, (status, capture) in querybudget.measure().items():
+            with self.subTest(name):
+                self.assertLess(status, 400)
+                self.assertIn(name, querybudget.BUDGETS, "no budget")
+                repeated = "".join(f"\n  {times}x {sql}" for times, sql, _origins in capture.duplicates())
+                self.assertLessEqual(len(capture.queries), querybudget.BUDGETS[name], f"over budget{repeated}")
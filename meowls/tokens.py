@@ -1,17 +1,221 @@
-from django.core import signing
+# meowls/tokens.py
+"""
+QR tokens that open a Meowl's detail page (?t=...).
+
+Short-lived tokens come in two formats, both accepted by verify_qr_token:
+  - "compact" (QR_TOKEN_FORMAT default): base64url of a kind byte, a 4-byte
+    issue time and a truncated HMAC-SHA256 over those and the slug. 24
+    characters, and no slug inside since the URL path already carries it,
+    so poster URLs fit a smaller QR version.
+  - "signed": Django's TimestampSigner, "<slug>:<time>:<signature>", which
+    is what older posters carry.
+
+Printed posters carry a poster token instead: the compact layout with a
+PosterSerial id where the time would be, and the serial's Meowl id mixed
+into the MAC so a later Meowl reusing the slug can't accept it. It never
+expires; it works for as long as its serial is live (not revoked, not
+deleted). Live serials are held in an in-process map that's reloaded when
+the "poster_serials" generation is bumped (or every
+POSTER_REVOCATION_REFRESH seconds, for per-process caches), so checking
+one costs a dict lookup, not a query.
+
+Signer and HMAC key are built once per SECRET_KEY rather than per call.
+Tokens that verify are remembered (up to QR_TOKEN_CACHE_SIZE) with their
+issue time, so the reloads after a scan only compare a timestamp until
+the token expires.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import struct
+import threading
+import time
+from collections import OrderedDict
+
 from django.conf import settings
-from datetime import timedelta
+from django.core import signing
+
+from .caching import generation
+
+SALT = "meowls.qr"
+KIND_DETAIL = 1
+KIND_POSTER = 2
+MAC_BYTES = 13  # 1 + 4 + 13 = 18 bytes = 24 base64 characters, no padding
+_header = struct.Struct(">BI")  # kind, issued at (unix seconds) or poster serial
+
+_crypto = (None, None, ())  # (SECRET_KEY, signer, HMAC per key incl. fallbacks)
+
+
+def _keys():
+    global _crypto
+    if _crypto[0] != settings.SECRET_KEY:
+        macs = tuple(
+            hmac.new(hashlib.sha256(f"{SALT}:{secret}".encode()).digest(), digestmod=hashlib.sha256)
+            for secret in (settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS)
+        )
+        _crypto = (settings.SECRET_KEY, signing.TimestampSigner(), macs)
+    return _crypto[1], _crypto[2]
+
+
+def _mac(proto, header: bytes, slug: str, meowl_id: int | None = None) -> bytes:
+    mac = proto.copy()  # keyed pads are already computed; copy() skips that
+    mac.update(header)
+    mac.update(slug.encode())
+    if meowl_id is not None:
+        mac.update(b":%d" % meowl_id)
+    return mac.digest()[:MAC_BYTES]
+
+
+class _Verified:
+    """
+    Bounded LRU of (token, slug) -> (kind, issue time or serial) for tokens
+    whose signature checked out.
+    """
+    def __init__(self):
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+            return entry
+
+    def add(self, key, entry: tuple[int, int]) -> None:
+        with self._lock:
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            while len(self._items) > settings.QR_TOKEN_CACHE_SIZE:
+                self._items.popitem(last=False)
+
+    def discard(self, key) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+verified = _Verified()
+
+
+def _compact(kind: int, value: int, slug: str, meowl_id: int | None = None) -> str:
+    _signer, macs = _keys()
+    header = _header.pack(kind, value)
+    return base64.urlsafe_b64encode(header + _mac(macs[0], header, slug, meowl_id)).decode().rstrip("=")
+
+
+def make_qr_token(slug: str, fmt: str | None = None) -> str:
+    fmt = fmt or settings.QR_TOKEN_FORMAT
+    if fmt == "signed":
+        return _keys()[0].sign(slug)
+    return _compact(KIND_DETAIL, int(time.time()), slug)
+
+
+def make_poster_token(slug: str, serial: int, meowl_id: int) -> str:
+    return _compact(KIND_POSTER, serial, slug, meowl_id)
+
+
+def _parse(token: str, slug: str) -> tuple[int, int] | None:
+    """
+    (kind, issue time or serial) if `token`'s signature is good for `slug`.
+    Age isn't checked here; a poster token can only be checked while its
+    serial is live, since the MAC covers the serial's Meowl id.
+    """
+    signer, macs = _keys()
+    if ":" in token:
+        try:
+            value, stamp = signer.unsign(token), token.rsplit(":", 2)[1]
+        except signing.BadSignature:
+            return None
+        return (KIND_DETAIL, signing.b62_decode(stamp)) if value == slug else None
+
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, binascii.Error):
+        return None
+    if len(raw) != _header.size + MAC_BYTES:
+        return None
+    header, mac = raw[:_header.size], raw[_header.size:]
+    kind, value = _header.unpack(header)
+    if kind == KIND_DETAIL:
+        meowl_id = None
+    elif kind == KIND_POSTER:
+        meowl_id = live_serials(value).get(value)
+        if meowl_id is None:
+            return None
+    else:
+        return None
+    if any(hmac.compare_digest(_mac(proto, header, slug, meowl_id), mac) for proto in macs):
+        return kind, value
+    return None
+
+
+_serials = (None, 0.0, {}, 0)  # (generation, loaded at, live serial -> Meowl id, newest serial)
+
+
+def live_serials(serial: int | None = None) -> dict[int, int]:
+    """
+    Live PosterSerial id -> Meowl id. Pass the serial being checked: one
+    newer than any loaded was probably just issued by another process, so
+    that reloads early (at most once a second).
+    """
+    global _serials
+    gen, loaded_at, serials, newest = _serials
+    age = time.monotonic() - loaded_at
+    current = generation("poster_serials")
+    if current != gen or age > settings.POSTER_REVOCATION_REFRESH or (serial is not None and serial > newest and age > 1):
+        from .models import PosterSerial
+
+        loaded_at = time.monotonic()
+        serials = dict(PosterSerial.objects.filter(revoked_at__isnull=True).values_list("pk", "meowl_id"))
+        newest = PosterSerial.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        _serials = (current, loaded_at, serials, newest)
+    return serials
+
+
+def _live(entry: tuple[int, int], now: float, max_age_minutes: int) -> bool:
+    kind, value = entry
+    if kind == KIND_POSTER:
+        return value in live_serials()
+    return now - value <= max_age_minutes * 60
+
+
+def verify_qr_token(token: str | None, slug: str, max_age_minutes: int | None = None) -> bool:
+    """
+    Is `token` a live QR token (short-lived or poster) for `slug`?
+    """
+    if not token:
+        return False
+    if max_age_minutes is None:
+        max_age_minutes = settings.QR_TOKEN_MINUTES
+    now = time.time()
+    key = (token, slug)
+    entry = verified.get(key)
+    if entry is not None:
+        if _live(entry, now, max_age_minutes):
+            return True
+        verified.discard(key)
+        return False
+    entry = _parse(token, slug)
+    if entry is None or not _live(entry, now, max_age_minutes):
+        return False
+    verified.add(key, entry)
+    return True
 
-def make_qr_token(slug: str) -> str:
-    signer = signing.TimestampSigner()
-    return signer.sign(slug)
 
 def check_qr_token(token: str, max_age_minutes: int = None) -> str|None:
+    """
+    The slug inside a "signed" token, if it's valid and fresh. Compact
+    tokens carry no slug; check those with verify_qr_token.
+    """
     if max_age_minutes is None:
         max_age_minutes = settings.QR_TOKEN_MINUTES
-    signer = signing.TimestampSigner()
+    signer, _macs = _keys()
     try:
-        slug = signer.unsign(token, max_age=max_age_minutes*60)
-        return slug
+        return signer.unsign(token, max_age=max_age_minutes * 60)
     except signing.BadSignature:
         return None
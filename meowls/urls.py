@@ -1,6 +1,6 @@
 # meowls/urls.py
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = "meowls"
 
@@ -9,14 +9,28 @@ urlpatterns = [
     path("", views.meowl_index, name="index"),
     path("create/", views.meowl_create, name="create"),
     path("leaderboard/", views.leaderboard, name="leaderboard"),
+    path("leaderboard/<str:period>/", views.leaderboard, name="leaderboard_period"),
+
+    # read-only JSON API (api.py)
+    path("api/meowls/", api.meowl_list, name="api_meowls"),
+    path("api/meowls/near/", api.meowl_near, name="api_meowls_near"),
+    path("api/meowls/<slug:slug>/", api.meowl_detail, name="api_meowl"),
+    path("api/meowls/<slug:slug>/comments/", api.meowl_comments, name="api_comments"),
+    path("api/tiles/<int:z>/<int:x>/<int:y>.json", api.map_tile, name="api_tile"),
+    path("api/leaderboard/", api.leaderboard, name="api_leaderboard"),
+    path("api/leaderboard/<str:period>/", api.leaderboard, name="api_leaderboard_period"),
 
     # public auth
     path("signup/", views.signup, name="signup"),
 
     # staff tools
     path("admin/", views.staff_dashboard, name="staff_dashboard"),
+    path("admin/posters/export/", views.export_posters, name="export_posters"),
+    path("admin/metrics/", views.metrics_view, name="metrics"),
+    path("admin/export/", views.export_data, name="export_data"),
     path("admin/meowl/<slug:slug>/archive/", views.archive_meowl, name="archive_meowl"),
     path("admin/meowl/<slug:slug>/unarchive/", views.unarchive_meowl, name="unarchive_meowl"),
+    path("admin/meowl/<slug:slug>/poster/reissue/", views.reissue_poster, name="reissue_poster"),
     path("admin/comment/<int:pk>/hide/", views.hide_comment, name="hide_comment"),
     path("admin/comment/<int:pk>/unhide/", views.unhide_comment, name="unhide_comment"),
     path("admin/user/<int:user_id>/promote/", views.promote_user, name="promote_user"),
@@ -27,6 +41,7 @@ urlpatterns = [
     # other fixed routes for a specific meowl
     path("<slug:slug>/scan/", views.scan_meowl, name="scan"),
     path("<slug:slug>/pdf/preview/", views.pdf_preview, name="pdf_preview"),
+    path("<slug:slug>/pdf/status/", views.pdf_status, name="pdf_status"),
     path("<slug:slug>/pdf/file/", views.pdf_file, name="pdf_file"),   # <-- NEW inline view
     path("<slug:slug>/pdf/download/", views.pdf_download, name="pdf_download"),
 
@@ -34,6 +49,8 @@ urlpatterns = [
     path("verify/<uidb64>/<token>/", views.verify_email, name="verify_email"),
     path("resend-verification/", views.resend_verification, name="resend_verification"),
 
+    path("<slug:slug>/comments/", views.meowl_comments, name="comments"),
+
     # catch-all detail view MUST be last
     path("<slug:slug>/", views.meowl_detail, name="detail"),
 ]
@@ -1,7 +1,12 @@
 # meowls/utils.py
+from datetime import datetime, time, timedelta
+
 from django.utils import timezone
-from django.db.models import Sum
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncDate
 from django.conf import settings
+from django.core.cache import cache
 from django.core.mail import send_mail
 from django.urls import reverse
 from django.utils.timezone import now
@@ -9,20 +14,212 @@ from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.contrib.auth.tokens import default_token_generator
 
-from .models import PointsLedger, UserStatus
+from . import audit
+from .caching import bump, generation
+from .models import Comment, DailyPoints, PointsLedger, PosterSerial, Scan, UserPoints, UserStatus
+from .poster_cache import invalidate as invalidate_poster
+
+LEADERBOARD_PERIODS = ("all", "30d", "7d")
+PERIOD_DAYS = {"7d": 7, "30d": 30}
+
+
+def day_range(day=None):
+    """
+    [start, end) datetimes of a local day. Filter with created_at__gte/__lt
+    instead of created_at__date so the (…, created_at) indexes can be used:
+    __date wraps the column in a function on both SQLite and MariaDB.
+    """
+    if day is None:
+        day = timezone.localdate()
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def leaderboard(period: str = "all", include_suspended: bool = True):
+    """
+    Rows of {"user__username", "total"}, best first. Reads the UserPoints /
+    DailyPoints rollups instead of aggregating the whole ledger.
+    """
+    if period in PERIOD_DAYS:
+        first_day = timezone.localdate() - timezone.timedelta(days=PERIOD_DAYS[period] - 1)
+        qs = (DailyPoints.objects.filter(day__gte=first_day)
+                .values("user__username")
+                .annotate(total=Sum("points")))
+    else:
+        qs = UserPoints.objects.values("user__username", "total")
+
+    if not include_suspended:
+        qs = qs.filter(Q(user__status__is_suspended=False) | Q(user__status__isnull=True))
+    return qs.order_by("-total")
+
+
+def leaderboard_version(period: str) -> str:
+    """
+    What a period's rankings depend on: the "leaderboard" generation (bumped
+    by points and suspensions) and, for 7d/30d, the day the window ends on.
+    """
+    version = str(generation("leaderboard"))
+    if period in PERIOD_DAYS:
+        version += f":{timezone.localdate().isoformat()}"
+    return version
+
+
+def cached_leaderboard(period: str = "all", limit: int = 100, version: str | None = None) -> list[dict]:
+    """
+    Top `limit` non-suspended users for the period, cached for
+    LEADERBOARD_CACHE_SECONDS under its leaderboard_version(), so a new
+    award, a suspension or midnight retires it.
+    """
+    key = f"meowls:leaderboard:{period}:{version or leaderboard_version(period)}"
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(leaderboard(period, include_suspended=False)[:limit])
+        cache.set(key, rows, settings.LEADERBOARD_CACHE_SECONDS)
+    return rows
+
+
+def invalidate_leaderboard() -> None:
+    bump("leaderboard")
+
+
+def _bump(model, lookup: dict, field: str, delta: int, **extra) -> None:
+    """
+    UPDATE ... SET field = field + delta, inserting the row if it's missing.
+    """
+    if model.objects.filter(**lookup).update(**{field: F(field) + delta}, **extra):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **{field: delta}, **extra)
+    except IntegrityError:
+        # someone else inserted it first
+        model.objects.filter(**lookup).update(**{field: F(field) + delta}, **extra)
+
+
+def award_points(user, points: int, reason: str, meowl=None) -> PointsLedger:
+    """
+    Write a ledger row and roll it into UserPoints/DailyPoints atomically.
+    All point awards should go through here so the rollups stay exact.
+    """
+    with transaction.atomic():
+        entry = PointsLedger.objects.create(user=user, meowl=meowl, points=points, reason=reason)
+        _bump(UserPoints, {"user": user}, "total", points, updated_at=entry.created_at)
+        _bump(DailyPoints, {"user": user, "day": timezone.localdate(entry.created_at)}, "points", points)
+    return entry
+
+
+def record_scan(meowl, user, user_agent: str = "", ip: str = "", points: int = 5) -> bool:
+    """
+    Record today's scan of `meowl` by `user` with its points and audit row,
+    all in one transaction. Returns False (writing nothing) if the user
+    already scanned it today: the scan_once_per_day constraint rejects the
+    insert, so concurrent double taps can't both award points.
+    """
+    day = timezone.localdate()
+    # repeat visits are the common case: answer them with a read instead of
+    # an insert that fails (and takes the write lock on SQLite)
+    if Scan.objects.filter(meowl=meowl, user=user, day=day).exists():
+        return False
+    try:
+        with transaction.atomic():
+            # Meowl.scan_count/last_scanned_at follow via scanstats (signals.py)
+            Scan.objects.create(meowl=meowl, user=user, user_agent=user_agent, ip_hash=ip, day=day)
+            award_points(user, points, "scan", meowl=meowl)
+            audit.log(user, action="scan", meowl=meowl, detail=f"Scanned {meowl.slug}")
+    except IntegrityError:
+        return False
+    return True
+
+
+def poster_serials(meowls, user=None) -> dict[int, int]:
+    """
+    Meowl id -> its live PosterSerial id, starting one for any Meowl that
+    has none yet (first print). A couple of queries however many Meowls.
+    """
+    ids = [m.pk for m in meowls]
+
+    def live():
+        # newest live serial wins if a race ever made two
+        rows = PosterSerial.objects.filter(meowl_id__in=ids, revoked_at__isnull=True).order_by("meowl_id", "id")
+        return dict(rows.values_list("meowl_id", "id"))
+
+    serials = live()
+    if missing := [i for i in ids if i not in serials]:
+        created_by = user if user is not None and user.is_authenticated else None
+        PosterSerial.objects.bulk_create([PosterSerial(meowl_id=i, created_by=created_by) for i in missing])
+        transaction.on_commit(lambda: bump("poster_serials"))  # bulk_create sends no signals
+        serials = live()
+    return serials
+
+
+def reissue_poster(meowl, user) -> int:
+    """
+    Revoke `meowl`'s live poster serials, so printed copies stop opening
+    the page, and start a new one. Returns the new serial id.
+    """
+    with transaction.atomic():
+        revoked = PosterSerial.objects.filter(meowl=meowl, revoked_at__isnull=True).update(
+            revoked_at=now(), revoked_by=user
+        )
+        serial = PosterSerial.objects.create(meowl=meowl, created_by=user)
+        audit.log(user, action="poster_reissue", meowl=meowl, detail=f"Revoked {revoked} serial(s); new serial {serial.pk}")
+
+    def after_commit():
+        bump("poster_serials")  # update() sends no signals
+        invalidate_poster(meowl.slug)
+
+    transaction.on_commit(after_commit)
+    return serial.pk
+
+
+def visible_comment_count(meowl_id: int) -> int:
+    """
+    Non-hidden comments on a Meowl, cached until its comments change.
+    """
+    key = f"meowls:comment_count:{meowl_id}:{generation(f'comments:{meowl_id}')}"
+    return cache.get_or_set(
+        key, lambda: Comment.objects.filter(meowl_id=meowl_id).visible().count(), settings.PAGE_CACHE_SECONDS
+    )
+
 
+def ledger_rollups():
+    """
+    ({user_id: total}, {(user_id, day): points}) straight from PointsLedger.
+    """
+    totals = dict(
+        PointsLedger.objects.order_by().values("user_id").annotate(t=Sum("points")).values_list("user_id", "t")
+    )
+    daily = {
+        (row["user_id"], row["day"]): row["p"]
+        for row in (PointsLedger.objects.order_by()
+                    .annotate(day=TruncDate("created_at"))
+                    .values("user_id", "day")
+                    .annotate(p=Sum("points"))
+                    .iterator(chunk_size=5000))
+    }
+    return totals, daily
 
-def leaderboard(period: str = "all"):
-    qs = PointsLedger.objects.all()
-    now = timezone.now()
-    if period == "30d":
-        qs = qs.filter(created_at__gte=now - timezone.timedelta(days=30))
-    elif period == "7d":
-        qs = qs.filter(created_at__gte=now - timezone.timedelta(days=7))
 
-    return (qs.values("user__username")
-              .annotate(total=Sum("points"))
-              .order_by("-total"))
+def rebuild_points() -> tuple[int, int]:
+    """
+    Recompute UserPoints/DailyPoints from the ledger. Returns row counts.
+    """
+    with transaction.atomic():
+        # Clearing the rollups first takes their locks (on SQLite, the write
+        # lock) before the ledger is read. award_points writes its ledger row
+        # and rollups in one transaction, so it either committed before this
+        # point and is counted, or it waits and adds to the rebuilt rows.
+        UserPoints.objects.all().delete()
+        DailyPoints.objects.all().delete()
+        totals, daily = ledger_rollups()
+        UserPoints.objects.bulk_create(
+            [UserPoints(user_id=uid, total=total) for uid, total in totals.items()], batch_size=1000
+        )
+        DailyPoints.objects.bulk_create(
+            [DailyPoints(user_id=uid, day=day, points=p) for (uid, day), p in daily.items()], batch_size=1000
+        )
+        transaction.on_commit(invalidate_leaderboard)
+    return len(totals), len(daily)
 
 
 def send_email_verification(request, user):
@@ -1,21 +1,39 @@
+from functools import partial
+
 from django.contrib import messages
 from django.contrib.auth import get_user_model, login
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.db.models import Count, Sum, Q
+from django.db.models import Count, Q
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils.timezone import now
 from django.views.decorators.clickjacking import xframe_options_sameorigin
-from django.db.models import Max
 from django.utils.timezone import now, timedelta
-from django.utils.http import urlsafe_base64_decode
+from django.utils.http import http_date, urlsafe_base64_decode
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.contrib.auth.tokens import default_token_generator
-from .utils import send_email_verification
+from .utils import (
+    LEADERBOARD_PERIODS,
+    award_points,
+    cached_leaderboard,
+    day_range,
+    leaderboard_version,
+    record_scan,
+    reissue_poster as _reissue_poster,
+    send_email_verification,
+    visible_comment_count,
+)
 from django.conf import settings
 
+from . import audit, bulk, exports, jobs, metrics
+from .caching import cache_anonymous, generation
 from .forms import CommentForm, LocationProposalForm, ReasonForm, SignupForm
-from .models import AuditLog, Comment, Meowl, MeowlLocation, PointsLedger, Scan, UserStatus
+from .models import AuditLog, Comment, Meowl, MeowlLocation, UserStatus
+from .pagination import keyset_page
 from .pdf import build_meowl_pdf
-from .tokens import check_qr_token
+from .poster_cache import get_poster
+from .tokens import verify_qr_token
 
 
 
@@ -26,15 +44,20 @@ User = get_user_model()
 # -----------------------
 
 
+@cache_anonymous("meowls")
 def meowl_index(request):
+    # lazy: not evaluated when the cards fragment is cached
     meowls = (
         Meowl.objects
-        .select_related("owner")
         .filter(is_archived=False)           # hide archived ones
-        .annotate(last_scan=Max("scan__created_at"))  # add last scan timestamp
+        .only("name", "slug", "description", "last_scanned_at")
         .order_by("name")
     )
-    return render(request, "meowls/index.html", {"meowls": meowls})
+    return render(request, "meowls/index.html", {
+        "meowls": meowls,
+        "cache_gen": generation("meowls"),
+        "cache_seconds": settings.PAGE_CACHE_SECONDS,
+    })
 
 
 
@@ -52,10 +75,11 @@ def meowl_create(request):
 
 
     # Enforce daily limit
-    today = now().date()
+    day_start, day_end = day_range()
     daily_count = Meowl.objects.filter(
         owner=request.user,
-        created_at__date=today
+        created_at__gte=day_start,
+        created_at__lt=day_end,
     ).count()
     if daily_count >= 3:
         messages.error(request, "You’ve reached the daily limit of 3 Meowls.")
@@ -87,8 +111,8 @@ def meowl_create(request):
             verifier=request.user,
             verified_at=now(),
         )
-        PointsLedger.objects.create(user=request.user, meowl=m, points=10, reason="create")
-        AuditLog.objects.create(actor=request.user, action="create", meowl=m, detail=f"Created {m.slug}")
+        award_points(request.user, 10, "create", meowl=m)
+        audit.log(request.user, action="create", meowl=m, detail=f"Created {m.slug}")
         messages.success(request, "Meowl created. Generating printable poster…")
         return redirect("meowls:pdf_preview", slug=m.slug)
 
@@ -96,15 +120,31 @@ def meowl_create(request):
 
 
 
-def meowl_detail(request, slug):
-    m = get_object_or_404(Meowl.objects.select_related("owner"), slug=slug)
+def _token_ok(request, m) -> bool:
+    return verify_qr_token(request.GET.get("t"), m.slug)
+
+
+def _is_staff_or_owner(request, m) -> bool:
+    # staff/owner may always open a Meowl; everyone else needs a valid QR token
+    return request.user.is_authenticated and (request.user.is_staff or request.user == m.owner)
+
+
+COMMENT_PAGE_SIZE = 20
+COMMENT_ORDER = ["-created_at", "-id"]
+
+
+def _comment_list(request, m):
+    comments = m.comments.select_related("user")
+    if not (request.user.is_authenticated and request.user.is_staff):
+        comments = comments.visible()
+    return comments
+
 
-    token = request.GET.get("t")
-    token_ok = (token and check_qr_token(token) == slug)
+def meowl_detail(request, slug):
+    m = get_object_or_404(Meowl.objects.select_related("owner").with_location(), slug=slug)
 
-    # Allow staff/owner always; everyone else must have a valid QR token
-    is_staff_or_owner = request.user.is_authenticated and (request.user.is_staff or request.user == m.owner)
-    if not is_staff_or_owner and not token_ok:
+    token_ok = _token_ok(request, m)
+    if not (token_ok or _is_staff_or_owner(request, m)):
         messages.error(request, "This page can only be opened by scanning the official QR code.")
         return redirect("meowls:index")
 
@@ -115,16 +155,9 @@ def meowl_detail(request, slug):
     # --- AUTO SCAN (once per day) ---
     if request.method == "GET":
         if request.user.is_authenticated:
-            today = now().date()
-            already = Scan.objects.filter(
-                meowl=m, user=request.user, created_at__date=today
-            ).exists()
-            if not already:
-                ua = request.META.get("HTTP_USER_AGENT", "")
-                ip = request.META.get("REMOTE_ADDR", "")
-                Scan.objects.create(meowl=m, user=request.user, user_agent=ua, ip_hash=ip)
-                PointsLedger.objects.create(user=request.user, meowl=m, points=5, reason="scan")
-                AuditLog.objects.create(actor=request.user, action="scan", meowl=m, detail=f"Scanned {m.slug}")
+            ua = request.META.get("HTTP_USER_AGENT", "")
+            ip = request.META.get("REMOTE_ADDR", "")
+            if record_scan(m, request.user, ua, ip):
                 messages.success(request, "Scan recorded. +5 points!")
             else:
                 # Optional: gentle note; or remove this if you prefer no message
@@ -146,28 +179,59 @@ def meowl_detail(request, slug):
     else:
         comment_form = CommentForm()
 
-    comments = m.comments.select_related("user").order_by("-created_at")
-    if not (request.user.is_authenticated and request.user.is_staff):
-        comments = comments.filter(is_hidden=False)
-
     ctx = {
         "meowl": m,
-        "comments": comments,
+        # called by the template only when the comments fragment isn't cached
+        "comments_page": partial(keyset_page, _comment_list(request, m), COMMENT_ORDER, None, COMMENT_PAGE_SIZE),
+        "comment_count": visible_comment_count(m.pk),
+        "comments_gen": generation(f"comments:{m.pk}"),
+        "cache_seconds": settings.PAGE_CACHE_SECONDS,
         "comment_form": comment_form,
         "token_ok": token_ok,
     }
     return render(request, "meowls/detail.html", ctx)
 
 
+def meowl_comments(request, slug):
+    """
+    "Load more" for the detail page: the next COMMENT_PAGE_SIZE comments
+    after the ?after= cursor. HTML <li>s (next cursor in X-Next-Cursor)
+    or, with ?format=json, {"comments": [...], "next": cursor}.
+    """
+    m = get_object_or_404(Meowl.objects.select_related("owner"), slug=slug)
+    if not (_token_ok(request, m) or _is_staff_or_owner(request, m)):
+        return JsonResponse({"error": "forbidden"}, status=403)
+
+    page = keyset_page(_comment_list(request, m), COMMENT_ORDER, request.GET.get("after"), COMMENT_PAGE_SIZE)
+    if request.GET.get("format") == "json":
+        return JsonResponse({
+            "comments": [
+                {
+                    "id": c.id,
+                    "user": c.user.username,
+                    "text": c.text,
+                    "created_at": c.created_at.isoformat(),
+                    "is_hidden": c.is_hidden,
+                }
+                for c in page.items
+            ],
+            "next": page.next_cursor,
+        })
+    response = render(request, "meowls/_comment_items.html", {"comments": page.items})
+    if page.next_cursor:
+        response["X-Next-Cursor"] = page.next_cursor
+    return response
+
+
 @login_required
 def scan_meowl(request, slug):
     m = get_object_or_404(Meowl, slug=slug)
     ua = request.META.get("HTTP_USER_AGENT", "")
     ip = request.META.get("REMOTE_ADDR", "")
-    Scan.objects.create(meowl=m, user=request.user, user_agent=ua, ip_hash=ip)
-    PointsLedger.objects.create(user=request.user, meowl=m, points=5, reason="scan")
-    AuditLog.objects.create(actor=request.user, action="scan", meowl=m, detail=f"Scanned {m.slug}")
-    messages.success(request, "Scan recorded. +5 points!")
+    if record_scan(m, request.user, ua, ip):
+        messages.success(request, "Scan recorded. +5 points!")
+    else:
+        messages.info(request, "You already got today’s +5 points for this Meowl.")
     return redirect("meowls:detail", slug=slug)
 
 # -----------------------
@@ -178,37 +242,153 @@ staff_required = user_passes_test(lambda u: u.is_staff)
 superuser_required = user_passes_test(lambda u: u.is_superuser)
 
 
+DASHBOARD_PAGE_SIZE = 50
+
+
+def _dashboard_section(request, prefix, qs, ordering, params=("q",)):
+    """
+    One keyset-paginated dashboard table. Its query string keys are
+    prefixed (m_q, m_after, ...) so every section pages independently.
+    """
+    cursor_key = f"{prefix}_after"
+    page = keyset_page(qs, ordering, request.GET.get(cursor_key), DASHBOARD_PAGE_SIZE)
+
+    # the other sections' state, carried along by this section's search form
+    own = {cursor_key} | {f"{prefix}_{p}" for p in params}
+    keep = [(k, v) for k, values in request.GET.lists() if k not in own for v in values]
+
+    current = request.GET.copy()
+    current.pop(cursor_key, None)
+    section = {
+        "items": page.items,
+        "keep": keep,
+        "paged": cursor_key in request.GET,
+        "first_url": "?" + current.urlencode(),
+        "next_url": None,
+    }
+    if page.next_cursor:
+        current[cursor_key] = page.next_cursor
+        section["next_url"] = "?" + current.urlencode()
+    for p in params:
+        section[p] = request.GET.get(f"{prefix}_{p}", "").strip()
+    return section
+
+
 @staff_required
 def staff_dashboard(request):
-    # OPTIONAL: make sure every user has a UserStatus row so templates never explode
-    missing_ids = list(User.objects.filter(status__isnull=True).values_list("id", flat=True))
-    if missing_ids:
-        UserStatus.objects.bulk_create([UserStatus(user_id=uid) for uid in missing_ids], ignore_conflicts=True)
+    """
+    Each table is searched and keyset-paginated on its own; nothing loads
+    more than DASHBOARD_PAGE_SIZE rows.
+    """
+    g = request.GET
 
-    meowls = (
-        Meowl.objects.select_related("owner")
-        .annotate(visible_comments=Count("comments", filter=Q(comments__is_hidden=False)))
-        .order_by("name")
+    meowls = Meowl.objects.select_related("owner").annotate(
+        visible_comments=Count("comments", filter=Q(comments__is_hidden=False))
     )
+    if q := g.get("m_q", "").strip():
+        meowls = meowls.filter(Q(name__icontains=q) | Q(slug__icontains=q) | Q(owner__username__iexact=q))
+    if (state := g.get("m_state")) in ("active", "archived"):
+        meowls = meowls.filter(is_archived=(state == "archived"))
+
+    comments = Comment.objects.select_related("user", "meowl")
+    if q := g.get("c_q", "").strip():
+        comments = comments.filter(Q(text__icontains=q) | Q(user__username__iexact=q) | Q(meowl__slug=q))
+    if (state := g.get("c_state")) in ("visible", "hidden"):
+        comments = comments.filter(is_hidden=(state == "hidden"))
+
+    audit.flush()  # show actions that are still buffered
+    logs = AuditLog.objects.select_related("actor", "target_user", "meowl")
+    if q := g.get("l_q", "").strip():
+        logs = logs.filter(Q(actor__username__iexact=q) | Q(target_user__username__iexact=q) | Q(meowl__slug=q))
+    if action := g.get("l_action"):
+        logs = logs.filter(action=action)
 
     # ✅ use "status" (not "userstatus")
-    users = User.objects.select_related("status").order_by("username")
-
-    recent_comments = (
-        Comment.objects.select_related("user", "meowl")
-        .order_by("-created_at")[:50]
-    )
-    logs = (
-        AuditLog.objects.select_related("actor", "target_user", "meowl")
-        .order_by("-created_at")[:100]
-    )
+    users = User.objects.select_related("status")
+    if q := g.get("u_q", "").strip():
+        users = users.filter(Q(username__icontains=q) | Q(email__icontains=q))
+    if (role := g.get("u_role")) == "staff":
+        users = users.filter(is_staff=True)
+    elif role == "suspended":
+        users = users.filter(status__is_suspended=True)
 
     return render(
         request,
         "meowls/admin_dashboard.html",
-        {"meowls": meowls, "recent_comments": recent_comments, "users": users, "logs": logs},
+        {
+            "meowls": _dashboard_section(request, "m", meowls, ["name", "id"], ("q", "state")),
+            "recent_comments": _dashboard_section(request, "c", comments, ["-created_at", "-id"], ("q", "state")),
+            "logs": _dashboard_section(request, "l", logs, ["-created_at", "-id"], ("q", "action")),
+            "users": _dashboard_section(request, "u", users, ["username", "id"], ("q", "role")),
+            "log_actions": AuditLog.ACTION_CHOICES,
+        },
     )
 
+@staff_required
+def metrics_view(request):
+    """
+    Request/PDF timing histograms in Prometheus text format (PROFILING=1).
+    """
+    return HttpResponse(metrics.prometheus_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@staff_required
+def export_posters(request):
+    """
+    Bulk poster export from the dashboard: listed slugs (or every active
+    Meowl, optionally one owner's) as a streamed multi-page PDF or ZIP.
+    """
+    if request.method != "POST":
+        return redirect("meowls:staff_dashboard")
+    slugs = (request.POST.get("slugs") or "").replace(",", " ").split()
+    owner = (request.POST.get("owner") or "").strip()
+    include_archived = bool(request.POST.get("include_archived"))
+    meowls = list(bulk.select_meowls(slugs, owner, include_archived=include_archived))
+    if not meowls:
+        messages.error(request, "No Meowls match that export.")
+        return redirect("meowls:staff_dashboard")
+
+    # encode in this process: a pool forked from a web worker mid-response
+    # is the worker's memory times POSTER_WORKERS, per export; the pool is
+    # for manage.py export_posters
+    if request.POST.get("format") == "zip":
+        resp = StreamingHttpResponse(bulk.iter_posters_zip(meowls, workers=1), content_type="application/zip")
+        resp["Content-Disposition"] = 'attachment; filename="meowl-posters.zip"'
+    else:
+        resp = StreamingHttpResponse(bulk.iter_posters_pdf(meowls, workers=1), content_type="application/pdf")
+        resp["Content-Disposition"] = 'attachment; filename="meowl-posters.pdf"'
+    return resp
+
+
+@staff_required
+def export_data(request):
+    """
+    Streamed analytics export: ?dataset=scans|ledger|audit&format=csv|ndjson,
+    optionally &start=&end= (dates or datetimes, end exclusive) and
+    &since_id= for incremental pulls. See exports.py.
+    """
+    g = request.GET
+    dataset, fmt = g.get("dataset", ""), g.get("format", "csv")
+    try:
+        since_id = int(g["since_id"]) if g.get("since_id") else None
+    except ValueError:
+        return HttpResponse("Bad export request: since_id must be a number\n", status=400, content_type="text/plain")
+    try:
+        chunks = exports.export(
+            dataset, fmt,
+            start=exports.parse_moment(g.get("start"), "start"),
+            end=exports.parse_moment(g.get("end"), "end"),
+            since_id=since_id,
+        )
+    except exports.ExportError as e:
+        return HttpResponse(f"Bad export request: {e}\n", status=400, content_type="text/plain")
+
+    resp = StreamingHttpResponse(chunks, content_type=exports.FORMATS[fmt])
+    resp["Content-Disposition"] = f'attachment; filename="meowl-{dataset}-{now():%Y%m%d-%H%M%S}.{fmt}"'
+    resp["X-Accel-Buffering"] = "no"  # let nginx pass rows through as they come
+    return resp
+
+
 @staff_required
 def archive_meowl(request, slug):
     if request.method != "POST":
@@ -218,8 +398,8 @@ def archive_meowl(request, slug):
         m.is_archived = True
         m.archived_at = now()
         m.archived_by = request.user
-        m.save(update_fields=["is_archived", "archived_at", "archived_by"])
-        AuditLog.objects.create(actor=request.user, action="meowl_archive", meowl=m, detail=f"Archived {m.slug}")
+        m.save(update_fields=["is_archived", "archived_at", "archived_by", "updated_at"])
+        audit.log(request.user, action="meowl_archive", meowl=m, detail=f"Archived {m.slug}")
         messages.success(request, f"Archived {m.name}.")
     return redirect("meowls:staff_dashboard")
 
@@ -233,8 +413,8 @@ def unarchive_meowl(request, slug):
         m.is_archived = False
         m.archived_at = None
         m.archived_by = None
-        m.save(update_fields=["is_archived", "archived_at", "archived_by"])
-        AuditLog.objects.create(actor=request.user, action="meowl_unarchive", meowl=m, detail=f"Unarchived {m.slug}")
+        m.save(update_fields=["is_archived", "archived_at", "archived_by", "updated_at"])
+        audit.log(request.user, action="meowl_unarchive", meowl=m, detail=f"Unarchived {m.slug}")
         messages.success(request, f"Unarchived {m.name}.")
     return redirect("meowls:staff_dashboard")
 
@@ -250,8 +430,8 @@ def hide_comment(request, pk: int):
         c.hidden_by = request.user
         c.save(update_fields=["is_hidden", "hidden_at", "hidden_by"])
         reason = (request.POST.get("reason") or "").strip()
-        AuditLog.objects.create(
-            actor=request.user,
+        audit.log(
+            request.user,
             action="comment_hide",
             meowl=c.meowl,
             comment_id=c.id,
@@ -271,8 +451,8 @@ def unhide_comment(request, pk: int):
         c.hidden_at = None
         c.hidden_by = None
         c.save(update_fields=["is_hidden", "hidden_at", "hidden_by"])
-        AuditLog.objects.create(
-            actor=request.user,
+        audit.log(
+            request.user,
             action="comment_unhide",
             meowl=c.meowl,
             comment_id=c.id,
@@ -289,7 +469,7 @@ def promote_user(request, user_id: int):
     if not u.is_staff:
         u.is_staff = True
         u.save(update_fields=["is_staff"])
-        AuditLog.objects.create(actor=request.user, action="user_promote", target_user=u)
+        audit.log(request.user, action="user_promote", target_user=u)
         messages.success(request, f"Promoted {u.username} to staff.")
     return redirect("meowls:staff_dashboard")
 
@@ -302,7 +482,7 @@ def demote_user(request, user_id: int):
     if u.is_staff and u != request.user:
         u.is_staff = False
         u.save(update_fields=["is_staff"])
-        AuditLog.objects.create(actor=request.user, action="user_demote", target_user=u)
+        audit.log(request.user, action="user_demote", target_user=u)
         messages.success(request, f"Demoted {u.username} from staff.")
     elif u == request.user:
         messages.error(request, "You can’t demote yourself.")
@@ -312,19 +492,72 @@ def demote_user(request, user_id: int):
 # PDF (viewer + file endpoints)
 # -----------------------
 
-@login_required
 @login_required
 def pdf_preview(request, slug):
     """
     Renders an HTML viewer page with an <iframe> that loads the PDF.
     Only staff or the owner can view.
+    The poster renders in the background; the page polls pdf_status
+    and only points the iframe at pdf_file once it's ready.
     """
     m = get_object_or_404(Meowl, slug=slug)
-    is_owner = request.user == m.owner
+    is_owner = request.user.pk == m.owner_id
     if not (request.user.is_staff or is_owner):
         messages.error(request, "Only staff or the owner can view the PDF.")
         return redirect("meowls:detail", slug=slug)
-    return render(request, "meowls/pdf_preview.html", {"meowl": m, "is_owner": is_owner})
+    poster_status = jobs.poster_status(m, request.user)
+    return render(
+        request,
+        "meowls/pdf_preview.html",
+        {"meowl": m, "is_owner": is_owner, "poster_ready": poster_status == "done"},
+    )
+
+
+@staff_required
+def reissue_poster(request, slug):
+    """
+    Revoke the serial printed on this Meowl's posters and render a new one.
+    """
+    if request.method != "POST":
+        return redirect("meowls:pdf_preview", slug=slug)
+    m = get_object_or_404(Meowl, slug=slug)
+    _reissue_poster(m, request.user)
+    messages.success(request, f"Reissued the poster for {m.name}; previously printed copies no longer open it.")
+    return redirect("meowls:pdf_preview", slug=slug)
+
+
+@login_required
+def pdf_status(request, slug):
+    """
+    JSON poll target for pdf_preview: {"status": queued|running|done|failed}.
+    """
+    m = get_object_or_404(Meowl, slug=slug)
+    if not (request.user.is_staff or request.user == m.owner):
+        return JsonResponse({"error": "forbidden"}, status=403)
+    status = jobs.poster_status(m, request.user)
+    data = {"status": status}
+    if status == "done":
+        data["url"] = reverse("meowls:pdf_file", args=[m.slug])
+    return JsonResponse(data)
+
+
+def _poster_response(request, m, disposition: str):
+    """
+    Serve the cached poster, answering conditional GETs with 304.
+    """
+    poster = get_poster(m, build_meowl_pdf)
+    # whole seconds, like If-Modified-Since; a fractional mtime would never match
+    last_modified = int(poster.last_modified)
+    resp = get_conditional_response(request, etag=poster.etag, last_modified=last_modified)
+    if resp is None:
+        resp = FileResponse(poster.file, content_type="application/pdf")
+    else:
+        poster.file.close()
+    resp["Content-Disposition"] = disposition
+    resp["ETag"] = poster.etag
+    resp["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(resp, private=True, max_age=poster.max_age)
+    return resp
 
 
 @login_required
@@ -337,11 +570,7 @@ def pdf_file(request, slug):
     if not (request.user.is_staff or request.user == m.owner):
         messages.error(request, "Only staff or the owner can view the PDF.")
         return redirect("meowls:detail", slug=slug)
-    data = build_meowl_pdf(m)
-    from django.http import HttpResponse
-    resp = HttpResponse(data, content_type="application/pdf")
-    resp["Content-Disposition"] = 'inline; filename="meowl.pdf"'
-    return resp
+    return _poster_response(request, m, 'inline; filename="meowl.pdf"')
 
 @login_required
 def pdf_download(request, slug):
@@ -352,25 +581,29 @@ def pdf_download(request, slug):
     if not (request.user.is_staff or request.user == m.owner):
         messages.error(request, "Only staff or the owner can download the PDF.")
         return redirect("meowls:detail", slug=slug)
-    data = build_meowl_pdf(m)
-    from django.http import HttpResponse
-    resp = HttpResponse(data, content_type="application/pdf")
-    resp["Content-Disposition"] = f'attachment; filename="{m.slug}.pdf"'
-    return resp
+    return _poster_response(request, m, f'attachment; filename="{m.slug}.pdf"')
 
 # -----------------------
 # Leaderboard & signup
 # -----------------------
 
-def leaderboard(request):
-    rows = (
-        PointsLedger.objects
-        .filter(Q(user__status__is_suspended=False) | Q(user__status__isnull=True))
-        .values("user__username")
-        .annotate(points=Sum("points"))
-        .order_by("-points")[:100]
+@cache_anonymous("leaderboard")
+def leaderboard(request, period="all"):
+    if period not in LEADERBOARD_PERIODS:
+        raise Http404("Unknown leaderboard period")
+    version = leaderboard_version(period)
+    # the template calls this only when the rows fragment isn't cached
+    rows = partial(cached_leaderboard, period, version=version)
+    return render(
+        request,
+        "meowls/leaderboard.html",
+        {
+            "rows": rows,
+            "period": period,
+            "cache_gen": version,
+            "cache_seconds": settings.PAGE_CACHE_SECONDS,
+        },
     )
-    return render(request, "meowls/leaderboard.html", {"rows": rows})
 
 
 # meowls/views.py (inside signup)
@@ -407,7 +640,7 @@ def suspend_user(request, user_id: int):
         st.suspended_by = request.user
         st.reason = (request.POST.get("reason") or "").strip()
         st.save()
-        AuditLog.objects.create(actor=request.user, action="user_suspend", target_user=u, detail=st.reason)
+        audit.log(request.user, action="user_suspend", target_user=u, detail=st.reason)
         messages.success(request, f"Suspended {u.username}.")
     return redirect("meowls:staff_dashboard")
 
@@ -425,7 +658,7 @@ def unsuspend_user(request, user_id: int):
         st.suspended_by = None
         st.reason = ""
         st.save()
-        AuditLog.objects.create(actor=request.user, action="user_unsuspend", target_user=u)
+        audit.log(request.user, action="user_unsuspend", target_user=u)
         messages.success(request, f"Unsuspended {u.username}.")
     return redirect("meowls:staff_dashboard")
 